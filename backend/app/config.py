@@ -4,12 +4,22 @@ from pathlib import Path
 class Config:
     # Paths
     BASE_DIR = Path(__file__).parent.parent
-    MODEL_PATH = BASE_DIR / "saved_models" / "emotion_model_final.h5"
+    # Override to deploy another variant, e.g. saved_models/emotion_model_compact.h5
+    MODEL_PATH = Path(os.environ.get("MODEL_PATH", BASE_DIR / "saved_models" / "emotion_model_final.h5"))
+    # BatchNorm-folded export written by ml_training/export_model.py; loaded
+    # instead of MODEL_PATH when it is at least as new
+    INFERENCE_MODEL_PATH = MODEL_PATH.with_name(f"{MODEL_PATH.stem}_inference{MODEL_PATH.suffix}")
+    PREFER_INFERENCE_MODEL = os.environ.get("PREFER_INFERENCE_MODEL", "1") == "1"
     
     # Model settings
     IMG_SIZE = (48, 48)
     CLASS_NAMES = ["Fatigue", "Stress", "Normal"]
     
+    # Detector backend: "keras" (trained model + MediaPipe) or "fake"
+    # (deterministic, no model needed; for load tests and CI)
+    DETECTOR_BACKEND = os.environ.get("DETECTOR_BACKEND", "keras")
+    FAKE_INFERENCE_MS = float(os.environ.get("FAKE_INFERENCE_MS", "0"))  # Simulated model latency
+    
     # Risk calculation weights
     FATIGUE_WEIGHT = 0.5
     STRESS_WEIGHT = 0.3
@@ -25,6 +35,78 @@ class Config:
         "critical": (71, 100)
     }
     
+    # Change-detection gate: reuse the last prediction for unchanged face crops
+    CHANGE_GATE_ENABLED = os.environ.get("CHANGE_GATE_ENABLED", "1") == "1"
+    CHANGE_GATE_THRESHOLD = 0.02  # Mean absolute difference (0-1) of the thumbnails
+    CHANGE_GATE_MAX_REUSE = 10  # Consecutive reuses before inference is forced
+    CHANGE_GATE_SIZE = (12, 12)  # Thumbnail size compared between frames
+    
+    # Prediction cache: probabilities per preprocessed crop (replays, retries)
+    PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "2048"))  # 0 disables
+    PREDICTION_CACHE_CHECK_INTERVAL = 5.0  # Seconds between model file change checks
+    
+    # Hot model reload: watch MODEL_PATH and swap in a retrained model
+    MODEL_WATCH_ENABLED = os.environ.get("MODEL_WATCH_ENABLED", "1") == "1"
+    MODEL_WATCH_INTERVAL = 5.0  # Seconds between checks; a change must be stable for one interval
+    
+    # Server-side camera ingest ("station=rtsp://...;station=/path/video.mp4")
+    INGEST_SOURCES = os.environ.get("INGEST_SOURCES", "")
+    # Prefixes POST /api/streams may open ("rtsp://,/data/recordings/"); empty disables runtime adds
+    INGEST_RUNTIME_ALLOWED = [p.strip() for p in os.environ.get("INGEST_RUNTIME_ALLOWED", "").split(",") if p.strip()]
+    INGEST_RECONNECT_DELAY = 5.0  # Seconds before reopening a dropped stream
+    INGEST_DEFAULT_FILE_FPS = 25.0  # Assumed when a video file reports no frame rate
+    
+    # Shift history (append-only on-disk log)
+    HISTORY_DIR = BASE_DIR / "history"
+    HISTORY_FLUSH_INTERVAL = 2.0  # Seconds between background writes
+    HISTORY_BATCH_SIZE = 256  # Pending records that trigger an early write
+    EXPORT_CHUNK_ROWS = 50000  # Rows read and sent per chunk by report exports
+    
+    # What-if risk re-scoring of stored history
+    WHATIF_SESSION_GAP = 1800  # Seconds without frames that start a new session
+    WHATIF_CHUNK_ROWS = 20000  # Rows scored at once (small chunks stay in CPU cache)
+    WHATIF_MAX_CONFIGS = 256
+    
+    # History rollups: {bucket width in seconds: buckets retained}
+    ROLLUP_RESOLUTIONS = {
+        10: 8640,    # 24 hours
+        60: 10080,   # 7 days
+        600: 4464    # 31 days
+    }
+    ROLLUP_MAX_BUCKETS = 5000  # Largest bucketed history response
+    ROLLUP_INITIAL_SLOTS = 16  # Buckets allocated per width for a new station (doubled as needed)
+    
+    # Server-sent events
+    EVENT_INTERVAL = 1.0  # Seconds between broadcasts (per-client update cap)
+    EVENT_KEEPALIVE = 15.0  # Seconds of silence before a keep-alive comment
+    EVENT_RETRY_MS = 3000  # Client reconnect delay
+    
+    # Monitoring
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+    PROFILE_SAMPLE_EVERY = 100  # Profile one analyze call out of this many
+    PROFILE_STACK_INTERVAL = 0.002  # Seconds between stack samples of a profiled call
+    
+    # Adaptive capture interval recommended to stations
+    CAPTURE_INTERVAL_MS = 2000  # Base interval between frames
+    CAPTURE_MIN_INTERVAL_MS = 500
+    CAPTURE_MAX_INTERVAL_MS = 10000
+    CAPTURE_LEVEL_FACTORS = {
+        "normal": 1.5,
+        "warning": 1.0,
+        "critical": 0.5
+    }
+    CAPTURE_TREND_FACTORS = {
+        "increasing": 0.5,
+        "stable": 1.5,
+        "decreasing": 1.0
+    }
+    CAPTURE_TARGET_QUEUE_DEPTH = 8  # In-flight frames before every station is slowed down
+    
+    # Stations
+    DEFAULT_STATION = "default"
+    FLEET_STALE_AFTER = 300  # Seconds without frames before leaving the fleet overview
+    
     # API settings
     CORS_ORIGINS = [
         "http://localhost:5173",
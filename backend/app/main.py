@@ -1,11 +1,14 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 import cv2
 import numpy as np
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import io
+import threading
+import uuid
 from PIL import Image
 
 import sys
@@ -14,18 +17,39 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.models.emotion_model import EmotionDetector
+from app.models import create_detector
 from app.models.risk_engine import RiskEngine
 from app.utils.temporal_smoothing import TemporalSmoother
+from app.utils.history_store import HistoryStore, validate_station_id
+from app.utils.rollup import MultiResolutionRollup
+from app.utils.event_broadcaster import EventBroadcaster
+from app.utils.risk_leaderboard import RiskLeaderboard
+from app.utils.metrics import metrics
+from app.utils.profiler import SamplingProfiler
+from app.utils.capture_rate import CaptureRateController
+from app.utils.change_gate import FrameChangeGate
+from app.utils.model_watcher import ModelWatcher
+from app.utils.video_ingest import IngestManager, check_runtime_source
+from app.utils.report_export import iter_history_chunks, csv_stream, parquet_stream, parquet_available
+from app.utils.serialization import negotiated_response, select_fields, FastJSONResponse, MSGPACK_MEDIA_TYPE
+from app.utils.risk_whatif import run_whatif
+from app.schemas import AnalyzeFrameResponse, HistoryResponse, WhatIfConfig, WhatIfRequest
 from app.config import config
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Worker Fatigue Detection API",
     description="Real-time fatigue and stress detection for manufacturing workers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
+# Response blocks of /api/analyze-frame that clients may leave out via `fields`
+ANALYSIS_FIELDS = ("raw_prediction", "smoothed_prediction", "risk_assessment", "trend", "session_info")
+
+# Alternative media types of the analysis endpoints (for the OpenAPI docs)
+NEGOTIATED_CONTENT = {"application/json": {}, MSGPACK_MEDIA_TYPE: {}}
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -33,19 +57,103 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Initialize models
-emotion_detector = EmotionDetector()
+emotion_detector = create_detector()
 risk_engine = RiskEngine()
-temporal_smoother = TemporalSmoother()
+history_store = HistoryStore()
+history_rollup = MultiResolutionRollup()
+risk_leaderboard = RiskLeaderboard()
+profiler = SamplingProfiler()
+capture_rate = CaptureRateController()
+change_gate = FrameChangeGate()
+
+def reload_model() -> Dict:
+    """Swap in the model file and drop predictions made by the old one"""
+    result = emotion_detector.reload_model()
+    change_gate.clear()
+    return result
+
+model_watcher = (
+    ModelWatcher([config.MODEL_PATH, config.INFERENCE_MODEL_PATH], reload_model)
+    if emotion_detector.reloadable else None
+)
+event_broadcaster = EventBroadcaster(lambda station_id: build_summary(sessions.get(station_id)))
+ingest = IngestManager(lambda station_id, frame: ingest_frame(station_id, frame))
+
+# Store session data per station
+sessions: Dict[str, Dict] = {}
+sessions_lock = threading.Lock()
+
+# Distinguishes ETags issued by this server process
+BOOT_ID = uuid.uuid4().hex[:8]
+
+def check_station_id(station_id: str):
+    """Reject station ids that are not safe to use as log file names"""
+    try:
+        validate_station_id(station_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_session(station_id: str) -> Dict:
+    """Get (or create) the in-memory session of a station"""
+    check_station_id(station_id)
+    
+    session = sessions.get(station_id)
+    if session is None:
+        with sessions_lock:
+            session = sessions.setdefault(station_id, new_session())
+    return session
 
-# Store session data
-session_data = {
-    'predictions': [],
-    'session_start': None,
-    'frame_count': 0
-}
+def find_session(station_id: str) -> Optional[Dict]:
+    """Get the session of a station without creating one (for read paths)"""
+    check_station_id(station_id)
+    return sessions.get(station_id)
+
+def new_session() -> Dict:
+    """Empty session state of a station"""
+    return {
+        'predictions': [],
+        'session_start': None,
+        'frame_count': 0,
+        'smoother': TemporalSmoother(),
+        'next_seq': 1,        # Sequence number of the next prediction
+        'version': 0,         # Bumped on every change, used for ETags
+        'stats_cache': None,  # (version, batch statistics)
+        'lock': threading.Lock()  # Serializes frames of the station
+    }
+
+metrics.gauge("fatigue_active_sessions", "Stations with an in-memory session", lambda: len(sessions))
+metrics.gauge("fatigue_fleet_active_stations", "Stations with recent frames", lambda: len(risk_leaderboard))
+metrics.gauge("fatigue_frames_in_flight", "Frames being received or analyzed", lambda: capture_rate.queue_depth)
+metrics.gauge("fatigue_event_subscribers", "Connected server-sent event clients", event_broadcaster.subscriber_count)
+
+@app.on_event("startup")
+async def startup():
+    """Start background workers"""
+    history_store.start()
+    event_broadcaster.start()
+    if model_watcher is not None and config.MODEL_WATCH_ENABLED:
+        model_watcher.start()
+    ingest.start_configured()
+    
+    # Rebuild rollups from the persisted history they can still cover
+    span = max(width * retention for width, retention in config.ROLLUP_RESOLUTIONS.items())
+    since = datetime.now().timestamp() - span
+    for station_id in history_store.stations():
+        history_rollup.load(station_id, history_store.query(station_id, start=since))
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background workers and flush pending history to disk"""
+    profiler.disable()
+    ingest.stop_all()
+    if model_watcher is not None:
+        model_watcher.stop()
+    await event_broadcaster.stop()
+    history_store.stop()
 
 @app.get("/")
 async def root():
@@ -56,8 +164,16 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.post("/api/analyze-frame")
-async def analyze_frame(file: UploadFile = File(...)):
+@app.post(
+    "/api/analyze-frame",
+    responses={200: {"model": AnalyzeFrameResponse, "content": NEGOTIATED_CONTENT}}
+)
+async def analyze_frame(
+    request: Request,
+    file: UploadFile = File(...),
+    station_id: str = config.DEFAULT_STATION,
+    fields: Optional[str] = None
+):
     """
     Analyze a single frame for emotion detection
     
@@ -65,29 +181,93 @@ async def analyze_frame(file: UploadFile = File(...)):
         - Raw emotion prediction
         - Smoothed prediction
         - Risk assessment
+    
+    `fields` is a comma-separated subset of the response blocks to return.
+    Send `Accept: application/x-msgpack` for a binary response.
+    `recommended_interval_ms` tells the client when to send the next frame.
     """
+    accept = request.headers.get("accept")
+    select_fields({}, fields, ANALYSIS_FIELDS)  # Reject unknown fields before any work
+    
+    check_station_id(station_id)
+    
     try:
-        # Read image
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        with capture_rate.track():
+            # In a worker thread, so concurrent uploads are really in flight
+            return await run_in_threadpool(analyze_upload, station_id, file, fields, accept)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def analyze_upload(station_id: str, file: UploadFile, fields: Optional[str], accept: Optional[str]):
+    """
+    Read, decode, analyze and serialize one upload, sampled by the profiler
+    
+    Runs entirely in the calling (worker) thread so a profiled call covers
+    every stage of the request handler.
+    """
+    with profiler.sample():
+        # Read image (the upload is already spooled, so a blocking read is cheap)
+        with metrics.time_stage("upload_read"):
+            contents = file.file.read()
+        with metrics.time_stage("imdecode"):
+            nparr = np.frombuffer(contents, np.uint8)
+            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
         if image is None:
             raise HTTPException(status_code=400, detail="Invalid image file")
         
-        # Detect emotion
-        prediction = emotion_detector.predict_emotion(image)
+        response = process_frame(station_id, image)
         
+        with metrics.time_stage("serialization"):
+            return negotiated_response(select_fields(response, fields, ANALYSIS_FIELDS), accept)
+
+def ingest_frame(station_id: str, image: np.ndarray) -> Dict:
+    """process_frame of a server-side camera frame, counted as in flight"""
+    with capture_rate.track():
+        return process_frame(station_id, image)
+
+def process_frame(station_id: str, image: np.ndarray) -> Dict:
+    """
+    Run a decoded frame through detection, smoothing and risk scoring
+    
+    Updates the station session, history, leaderboard and dashboards, and
+    returns the analysis response.
+    """
+    session_data = get_session(station_id)
+    temporal_smoother = session_data['smoother']
+    
+    # Detect face
+    face = emotion_detector.extract_face(image)
+    metrics.count_frame(face_found=face is not None)
+    
+    if face is None:
+        last_risk = risk_leaderboard.get(station_id)
+        return {
+            "status": "no_face",
+            "message": "No face detected in frame",
+            "timestamp": datetime.now().isoformat(),
+            "recommended_interval_ms": capture_rate.recommend(last_risk['risk_level'] if last_risk else None)
+        }
+    
+    # An upload and an ingest thread may analyze frames of one station at once
+    with session_data['lock']:
+        # Predict emotion, unless the face is unchanged since the last prediction
+        bbox, face_processed = face
+        prediction = change_gate.reuse(station_id, face_processed, bbox)
         if prediction is None:
-            return JSONResponse({
-                "status": "no_face",
-                "message": "No face detected in frame",
-                "timestamp": datetime.now().isoformat()
-            })
+            prediction = emotion_detector.classify_face(face_processed, bbox)
+            change_gate.update(station_id, face_processed, prediction)
+        else:
+            metrics.count_skipped()
         
         # Add to temporal smoother
-        temporal_smoother.add_prediction(prediction['probabilities'])
-        smoothed_probs = temporal_smoother.get_smoothed_probabilities()
+        with metrics.time_stage("smoothing"):
+            temporal_smoother.add_prediction(prediction['probabilities'])
+            smoothed_probs = temporal_smoother.get_smoothed_probabilities()
+            trend = temporal_smoother.get_trend()
         
         # Calculate session duration
         if session_data['session_start'] is None:
@@ -96,22 +276,56 @@ async def analyze_frame(file: UploadFile = File(...)):
         duration = (datetime.now() - session_data['session_start']).total_seconds() / 60
         
         # Calculate risk with smoothed probabilities
-        risk_assessment = risk_engine.calculate_risk_score(
-            smoothed_probs['Fatigue'],
-            smoothed_probs['Stress'],
-            int(duration)
-        )
-        
-        # Get trend
-        trend = temporal_smoother.get_trend()
+        with metrics.time_stage("risk_score"):
+            risk_assessment = risk_engine.calculate_risk_score(
+                smoothed_probs['Fatigue'],
+                smoothed_probs['Stress'],
+                int(duration)
+            )
         
         # Store prediction
+        now = datetime.now()
+        prediction['timestamp'] = now
+        prediction['seq'] = session_data['next_seq']
+        session_data['next_seq'] += 1
         session_data['predictions'].append(prediction)
         session_data['frame_count'] += 1
+        session_data['version'] += 1  # After the change, see build_summary
+        
+        # Persist to the shift history log (written in the background)
+        stored_at = history_store.append(
+            station_id,
+            now,
+            prediction['probabilities'],
+            risk_assessment['risk_score']
+        )
+        history_rollup.add(station_id, stored_at, {
+            'fatigue': prediction['probabilities']['Fatigue'],
+            'stress': prediction['probabilities']['Stress'],
+            'normal': prediction['probabilities']['Normal'],
+            'risk_score': risk_assessment['risk_score']
+        })
+        
+        risk_leaderboard.update(
+            station_id,
+            risk_assessment['risk_score'],
+            risk_assessment['risk_level'],
+            trend,
+            stored_at
+        )
+        
+        # Notify dashboards (coalesced and sent by the broadcast loop)
+        event_broadcaster.publish(station_id, {
+            "timestamp": now.isoformat(),
+            "seq": prediction['seq'],
+            "smoothed_probabilities": smoothed_probs,
+            "risk_assessment": risk_assessment,
+            "trend": trend
+        })
         
         return {
             "status": "success",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "raw_prediction": {
                 "emotion": prediction['emotion'],
                 "confidence": prediction['confidence'],
@@ -127,24 +341,47 @@ async def analyze_frame(file: UploadFile = File(...)):
                 "duration_minutes": round(duration, 2),
                 "frame_count": session_data['frame_count'],
                 "buffer_size": temporal_smoother.get_buffer_size()
-            }
+            },
+            "recommended_interval_ms": capture_rate.recommend(risk_assessment['risk_level'], trend)
         }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/analytics/summary")
-async def get_analytics_summary():
-    """Get session analytics summary"""
+async def get_analytics_summary(request: Request, station_id: str = config.DEFAULT_STATION):
+    """
+    Get session analytics summary
+    
+    Responses carry a weak ETag tied to the session version; a matching
+    If-None-Match gets an empty 304 until a new frame is analyzed.
+    """
     
-    if not session_data['predictions']:
+    session_data = find_session(station_id)
+    version = session_data['version'] if session_data is not None else 0
+    
+    etag = f'W/"{BOOT_ID}-{station_id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return FastJSONResponse(build_summary(session_data), headers=headers)
+
+def build_summary(session_data: Optional[Dict]) -> Dict:
+    """Build the analytics summary of a session"""
+    if session_data is None or not session_data['predictions']:
         return {
             "status": "no_data",
             "message": "No predictions available yet"
         }
     
-    # Calculate statistics
-    stats = risk_engine.calculate_batch_statistics(session_data['predictions'])
+    # Calculate statistics (reused until the session changes). The version is
+    # read first: a frame landing during the computation must not get these
+    # (older) statistics cached under its newer version.
+    version = session_data['version']
+    cached = session_data['stats_cache']
+    if cached is not None and cached[0] == version:
+        stats = cached[1]
+    else:
+        stats = risk_engine.calculate_batch_statistics(list(session_data['predictions']))
+        session_data['stats_cache'] = (version, stats)
     
     # Session info
     duration = 0
@@ -159,54 +396,461 @@ async def get_analytics_summary():
             "total_frames": session_data['frame_count']
         },
         "statistics": stats,
-        "current_smoothed": temporal_smoother.get_smoothed_probabilities()
+        "current_smoothed": session_data['smoother'].get_smoothed_probabilities()
     }
 
-@app.get("/api/analytics/history")
-async def get_prediction_history(limit: int = 100):
-    """Get recent prediction history"""
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
     
-    recent_predictions = session_data['predictions'][-limit:]
+    def strip_weak(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+    
+    return strip_weak(etag) in {strip_weak(tag) for tag in if_none_match.split(",")}
+
+@app.get(
+    "/api/analytics/history",
+    responses={200: {"model": HistoryResponse, "content": NEGOTIATED_CONTENT}}
+)
+async def get_prediction_history(
+    request: Request,
+    limit: int = 100,
+    station_id: str = config.DEFAULT_STATION,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket_seconds: Optional[int] = None,
+    since: Optional[int] = None
+):
+    """
+    Get recent prediction history
+    
+    Without `bucket_seconds` the last `limit` raw predictions of the current
+    session are returned. Rows carry a sequence number; passing the last seen
+    one as `since` returns only newer rows (`incremental`), or the last `limit`
+    rows with `incremental: false` when more are newer. With `bucket_seconds`, min/mean/max per time bucket over
+    [start, end] are served from the precomputed rollups (default range is
+    the last `limit` buckets).
+    """
+    
+    if bucket_seconds is not None:
+        check_station_id(station_id)
+        return get_bucketed_history(station_id, start, end, bucket_seconds, limit)
+    
+    session_data = find_session(station_id)
+    if session_data is None:
+        return negotiated_response({
+            "status": "no_data",
+            "count": 0,
+            "incremental": False,
+            "first_seq": 1,
+            "last_seq": 0,
+            "history": []
+        }, request.headers.get("accept"))
+    
+    predictions = session_data['predictions']
+    first_seq = predictions[0]['seq'] if predictions else session_data['next_seq']
+    last_seq = session_data['next_seq'] - 1
+    
+    # A cursor ahead of the server (e.g. after a restart) gets a full resend,
+    # and so does one more than `limit` rows behind (appending would leave a gap)
+    incremental = since is not None and since <= last_seq and last_seq - max(since, first_seq - 1) <= limit
+    if incremental:
+        recent_predictions = predictions[max(0, since - first_seq + 1):]
+    else:
+        recent_predictions = predictions[-limit:]
     
     # Format for frontend charts
     history = []
-    for i, pred in enumerate(recent_predictions):
+    for pred in recent_predictions:
         history.append({
-            "index": i,
-            "timestamp": datetime.now().isoformat(),  # In real app, store actual timestamps
+            "index": pred['seq'] - first_seq,
+            "seq": pred['seq'],
+            "timestamp": pred['timestamp'].isoformat(),
             "fatigue": pred['probabilities']['Fatigue'] * 100,
             "stress": pred['probabilities']['Stress'] * 100,
             "normal": pred['probabilities']['Normal'] * 100,
             "emotion": pred['emotion']
         })
     
-    return {
+    return negotiated_response({
+        "status": "success",
+        "count": len(history),
+        "incremental": incremental,
+        "first_seq": first_seq,
+        "last_seq": last_seq,
+        "history": history
+    }, request.headers.get("accept"))
+
+def get_bucketed_history(
+    station_id: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    bucket_seconds: int,
+    limit: int
+) -> Dict:
+    """Format rollup buckets for frontend charts"""
+    if bucket_seconds <= 0:
+        raise HTTPException(status_code=400, detail="bucket_seconds must be positive")
+    
+    end_ts = end.timestamp() if end else datetime.now().timestamp()
+    # Default: the last `limit` whole buckets (the rollup aligns to bucket starts)
+    start_ts = start.timestamp() if start else (end_ts // bucket_seconds - limit + 1) * bucket_seconds
+    
+    if (end_ts - start_ts) / bucket_seconds > config.ROLLUP_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {config.ROLLUP_MAX_BUCKETS} buckets per request"
+        )
+    
+    try:
+        buckets = history_rollup.query(station_id, start_ts, end_ts, bucket_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    history = []
+    for i, bucket in enumerate(buckets):
+        entry = {
+            "index": i,
+            "timestamp": datetime.fromtimestamp(bucket['start']).isoformat(),
+            "count": bucket['count']
+        }
+        for name in ('fatigue', 'stress', 'normal'):
+            entry[name] = round(bucket[name]['mean'] * 100, 2)
+            entry[f"{name}_min"] = round(bucket[name]['min'] * 100, 2)
+            entry[f"{name}_max"] = round(bucket[name]['max'] * 100, 2)
+        entry['risk_score'] = round(bucket['risk_score']['mean'], 2)
+        entry['risk_score_min'] = round(bucket['risk_score']['min'], 2)
+        entry['risk_score_max'] = round(bucket['risk_score']['max'], 2)
+        history.append(entry)
+    
+    return FastJSONResponse({
         "status": "success",
+        "bucket_seconds": bucket_seconds,
         "count": len(history),
         "history": history
+    })
+
+@app.get("/api/reports/history")
+def get_shift_history(
+    station_id: str = config.DEFAULT_STATION,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 10000
+):
+    """
+    Get persisted shift history of a station
+    
+    Served from the on-disk log, so it survives restarts and session resets.
+    Only the newest `limit` rows of the range are read from disk (a plain
+    def, so FastAPI runs the file I/O in the thread pool).
+    """
+    check_station_id(station_id)
+    
+    limit = max(0, limit)
+    records = history_store.query(station_id, start, end, limit=limit + 1)
+    truncated = len(records) > limit
+    records = records[max(0, len(records) - limit):]
+    
+    history = [
+        {
+            "timestamp": datetime.fromtimestamp(float(r['timestamp'])).isoformat(),
+            "fatigue": round(float(r['fatigue']) * 100, 2),
+            "stress": round(float(r['stress']) * 100, 2),
+            "normal": round(float(r['normal']) * 100, 2),
+            "risk_score": round(float(r['risk_score']), 2)
+        }
+        for r in records
+    ]
+    
+    return FastJSONResponse({
+        "status": "success",
+        "station_id": station_id,
+        "count": len(history),
+        "truncated": truncated,
+        "history": history
+    })
+
+@app.get("/api/reports/export")
+async def export_shift_history(
+    format: str = "csv",
+    station_id: Optional[List[str]] = Query(None),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    risk_level: Optional[List[str]] = Query(None)
+):
+    """
+    Download persisted shift history as CSV or Parquet
+    
+    Rows are read from the on-disk logs and sent chunk by chunk, so large
+    exports never sit in memory as a whole.
+    
+    Args:
+        format: csv or parquet (requires pyarrow)
+        station_id: Stations to include, repeatable (default: all recorded)
+        start: Inclusive lower time bound
+        end: Inclusive upper time bound
+        risk_level: Only rows at these levels, repeatable (normal, warning, critical)
+    """
+    if format not in ("csv", "parquet"):
+        raise HTTPException(status_code=400, detail="format must be csv or parquet")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow on the server")
+    
+    for level in risk_level or []:
+        if level not in config.RISK_LEVELS:
+            raise HTTPException(status_code=400, detail=f"Unknown risk level: {level}")
+    
+    station_ids = station_id or history_store.stations()
+    for sid in station_ids:
+        check_station_id(sid)
+    
+    chunks = iter_history_chunks(history_store, station_ids, start, end, risk_level)
+    filename = f"shift-history-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    if format == "parquet":
+        return StreamingResponse(parquet_stream(chunks), media_type="application/vnd.apache.parquet", headers=headers)
+    return StreamingResponse(csv_stream(chunks), media_type="text/csv", headers=headers)
+
+@app.post("/api/analytics/whatif")
+async def whatif_rescore(body: WhatIfRequest):
+    """
+    Re-score stored history under alternative risk weights and thresholds
+    
+    Every configuration is evaluated in one vectorized pass per station and
+    reported with rows per risk level and level-transition counts. The
+    current configuration is included first as "current" unless disabled.
+    """
+    configs = list(body.configs)
+    if body.include_current:
+        configs.insert(0, WhatIfConfig(name="current"))
+    if not configs:
+        raise HTTPException(status_code=400, detail="At least one configuration is required")
+    if len(configs) > config.WHATIF_MAX_CONFIGS:
+        raise HTTPException(status_code=400, detail=f"At most {config.WHATIF_MAX_CONFIGS} configurations per request")
+    
+    for sid in body.station_ids or []:
+        check_station_id(sid)
+    
+    engines = [
+        RiskEngine(c.fatigue_weight, c.stress_weight, c.duration_weight, c.risk_levels)
+        for c in configs
+    ]
+    names = [c.name or f"config_{i}" for i, c in enumerate(configs)]
+    
+    try:
+        return await run_in_threadpool(
+            run_whatif, history_store, engines, names, body.station_ids, body.start, body.end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/stations")
+async def list_stations():
+    """List stations with an active session or recorded history"""
+    return {
+        "status": "success",
+        "active": sorted(sessions.keys()),
+        "recorded": history_store.stations()
     }
 
+@app.get("/api/fleet/overview")
+async def get_fleet_overview(limit: int = 20, risk_level: Optional[str] = None):
+    """
+    Get the highest-risk stations across the fleet
+    
+    Ordered by current smoothed risk score; stations without recent frames
+    are left out.
+    """
+    if risk_level is not None and risk_level not in config.RISK_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Unknown risk level: {risk_level}")
+    
+    stations = risk_leaderboard.top(max(0, limit), risk_level)
+    for entry in stations:
+        entry['updated'] = datetime.fromtimestamp(entry['updated']).isoformat()
+    
+    return {
+        "status": "success",
+        "active_stations": len(risk_leaderboard),
+        "level_counts": risk_leaderboard.level_counts(),
+        "count": len(stations),
+        "stations": stations
+    }
+
+@app.get("/api/stream/events")
+async def stream_events(station_id: Optional[str] = None):
+    """
+    Server-sent events with risk updates and summaries
+    
+    Each client receives at most one update per station per broadcast
+    interval. Omit `station_id` to follow all stations.
+    """
+    if station_id is not None:
+        check_station_id(station_id)
+    
+    return StreamingResponse(
+        event_broadcaster.stream(station_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/streams")
+async def list_streams():
+    """Server-side camera sources and their ingest statistics"""
+    return {"streams": ingest.status()}
+
+@app.post("/api/streams")
+async def add_stream(source: str, station_id: str, fps: Optional[float] = None):
+    """
+    Start analyzing a camera or video file on the server
+    
+    Only sources under a prefix in INGEST_RUNTIME_ALLOWED are accepted
+    (none by default).
+    
+    Args:
+        source: RTSP/HTTP URL or path of a video file on the server
+        station_id: Session the frames are analyzed under
+        fps: Frames analyzed per second (default: follow the recommended
+             capture interval)
+    """
+    if fps is not None and fps <= 0:
+        raise HTTPException(status_code=400, detail="fps must be positive")
+    
+    try:
+        check_runtime_source(source)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    
+    try:
+        return ingest.add(station_id, source, fps)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.delete("/api/streams/{station_id}")
+async def remove_stream(station_id: str):
+    """Stop the camera source of a station (the session is kept)"""
+    status = await run_in_threadpool(ingest.remove, station_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"No stream for station {station_id}")
+    return status
+
 @app.post("/api/session/reset")
-async def reset_session():
-    """Reset current session"""
-    session_data['predictions'].clear()
-    session_data['session_start'] = None
-    session_data['frame_count'] = 0
-    temporal_smoother.reset()
+async def reset_session(station_id: str = config.DEFAULT_STATION):
+    """Reset current session (persisted history is kept)"""
+    session_data = find_session(station_id)
+    if session_data is not None:
+        with session_data['lock']:
+            session_data['predictions'].clear()
+            session_data['session_start'] = None
+            session_data['frame_count'] = 0
+            session_data['smoother'].reset()
+            session_data['version'] += 1
+            risk_leaderboard.remove(station_id)
+            change_gate.reset(station_id)
+        
+        # Open dashboards clear the old session (the summary is now no_data)
+        event_broadcaster.publish(station_id, {
+            "timestamp": datetime.now().isoformat(),
+            "reset": True
+        })
     
     return {
         "status": "success",
         "message": "Session reset successfully"
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/admin/profile")
+async def get_profile(format: str = "summary", limit: int = 25):
+    """
+    Get profiling results of sampled analyze calls
+    
+    Formats:
+        - summary: JSON status and top functions by cumulative time
+        - text: pstats report
+        - pstats: binary dump, open with `python -m pstats` or snakeviz
+        - collapsed: stack samples for flamegraph.pl / speedscope
+    """
+    if format == "summary":
+        return profiler.summary(limit)
+    if format == "text":
+        return PlainTextResponse(profiler.text_report(limit))
+    if format == "pstats":
+        return Response(
+            profiler.pstats_dump(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="analyze_frame.pstats"'}
+        )
+    if format == "collapsed":
+        return PlainTextResponse(
+            profiler.collapsed_stacks(),
+            headers={"Content-Disposition": 'attachment; filename="analyze_frame.folded"'}
+        )
+    raise HTTPException(status_code=400, detail="format must be summary, text, pstats or collapsed")
+
+@app.post("/api/admin/profile")
+async def configure_profile(enabled: bool = True, every: Optional[int] = None, reset: bool = False):
+    """Turn profiling on or off, change the sampling rate or clear results"""
+    if every is not None and every < 1:
+        raise HTTPException(status_code=400, detail="every must be at least 1")
+    
+    if reset:
+        profiler.reset()
+    if enabled:
+        profiler.enable(every)
+    else:
+        profiler.disable()
+    
+    return profiler.summary(limit=0)
+
+@app.get("/api/admin/model")
+async def get_model_status():
+    """Loaded model version and the outcome of the last reload"""
+    return {
+        "detector_backend": emotion_detector.name,
+        "model_version": emotion_detector.model_version,
+        "reloadable": emotion_detector.reloadable,
+        "watcher": model_watcher.status() if model_watcher is not None else None
+    }
+
+@app.post("/api/admin/model/reload")
+async def reload_model_endpoint():
+    """
+    Load the model file again and swap it in
+    
+    Loading and warm-up run in a worker thread while the current model keeps
+    serving frames; only the final swap is visible to the analyze path.
+    """
+    if model_watcher is None:
+        raise HTTPException(status_code=400, detail=f"The {emotion_detector.name} backend has no model to reload")
+    
+    result = await run_in_threadpool(model_watcher.reload)
+    if result is None:
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {model_watcher.last_error}")
+    return result
+
 @app.get("/api/health")
 async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "model_loaded": emotion_detector.model is not None,
-        "session_active": session_data['session_start'] is not None,
-        "predictions_count": len(session_data['predictions'])
+        "model_loaded": emotion_detector.is_loaded,
+        "detector_backend": emotion_detector.name,
+        "model_version": emotion_detector.model_version,
+        "prediction_cache": emotion_detector.prediction_cache.stats(),
+        "session_active": any(s['session_start'] is not None for s in sessions.values()),
+        "active_stations": len(sessions),
+        "predictions_count": sum(len(s['predictions']) for s in sessions.values())
     }
 
 if __name__ == "__main__":
@@ -216,6 +860,7 @@ if __name__ == "__main__":
     print("=" * 60)
     print("  WORKER FATIGUE DETECTION API")
     print("=" * 60)
+    print(f"  Detector: {config.DETECTOR_BACKEND}")
     print(f"  Model path: {config.MODEL_PATH}")
     print(f"  Server: http://localhost:8000")
     print(f"  Docs: http://localhost:8000/docs")
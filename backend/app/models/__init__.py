@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+
+def create_detector(backend: str = None):
+    """
+    Create the emotion detector selected in config (DETECTOR_BACKEND)
+
+    Backends are imported lazily so the fake one works without TensorFlow
+    or MediaPipe installed.
+    """
+    backend = backend or config.DETECTOR_BACKEND
+
+    if backend == "keras":
+        from app.models.emotion_model import EmotionDetector
+        return EmotionDetector()
+    if backend == "fake":
+        from app.models.fake_detector import FakeEmotionDetector
+        return FakeEmotionDetector()
+
+    raise ValueError(f"Unknown detector backend: {backend!r} (expected 'keras' or 'fake')")
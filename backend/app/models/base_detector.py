@@ -0,0 +1,162 @@
+import cv2
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.utils.metrics import metrics
+from app.utils.prediction_cache import PredictionCache
+
+class BaseDetector(ABC):
+    """
+    Face detection + emotion classification pipeline
+    
+    Backends implement face detection and inference; preprocessing and the
+    prediction format are shared so every backend behaves the same to the API.
+    """
+    
+    name = "base"
+    reloadable = False  # Whether reload_model() is supported
+    
+    def __init__(self, model_path: Path = None):
+        """
+        Args:
+            model_path: Model file watched by the prediction cache (None if
+                        the backend has no model file)
+        """
+        self.class_names = config.CLASS_NAMES
+        self.prediction_cache = PredictionCache(watch_path=model_path)
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the backend is ready to serve predictions"""
+        return True
+    
+    @property
+    def model_version(self) -> str:
+        """Identifies the loaded weights (part of the prediction cache key)"""
+        return self.name
+    
+    def reload_model(self) -> Dict:
+        """
+        Load the model file again and swap it in without interrupting service
+        Returns: reload details (version, timings)
+        """
+        raise NotImplementedError(f"The {self.name} backend has no model to reload")
+    
+    @abstractmethod
+    def detect_face(self, image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Detect face in image
+        Returns: (x, y, w, h) or None
+        """
+    
+    @abstractmethod
+    def predict_probabilities(self, face_processed: np.ndarray) -> np.ndarray:
+        """
+        Classify a preprocessed face batch
+        Returns: class probabilities of the first face, ordered as class_names
+        """
+    
+    def preprocess_face(self, face_img: np.ndarray) -> np.ndarray:
+        """Preprocess face image for model input"""
+        # Resize to 48x48
+        face_resized = cv2.resize(face_img, config.IMG_SIZE)
+        
+        # Convert to grayscale
+        if len(face_resized.shape) == 3:
+            face_gray = cv2.cvtColor(face_resized, cv2.COLOR_BGR2GRAY)
+        else:
+            face_gray = face_resized
+        
+        # Normalize
+        face_normalized = face_gray / 255.0
+        
+        # Add batch and channel dimensions
+        face_processed = np.expand_dims(face_normalized, axis=-1)
+        face_processed = np.expand_dims(face_processed, axis=0)
+        
+        return face_processed
+    
+    def extract_face(self, image: np.ndarray) -> Optional[Tuple[Tuple[int, int, int, int], np.ndarray]]:
+        """
+        Detect and preprocess the face in an image
+        Returns: (bbox, preprocessed face batch) or None
+        """
+        # Detect face
+        with metrics.time_stage("detect_face"):
+            bbox = self.detect_face(image)
+        if bbox is None:
+            return None
+        
+        x, y, w, h = bbox
+        
+        # Extract face region
+        face_roi = image[y:y+h, x:x+w]
+        
+        if face_roi.size == 0:
+            return None
+        
+        # Preprocess
+        with metrics.time_stage("preprocess_face"):
+            face_processed = self.preprocess_face(face_roi)
+        
+        return bbox, face_processed
+    
+    def classify_face(self, face_processed: np.ndarray, bbox: Tuple[int, int, int, int]) -> Dict:
+        """
+        Predict emotion of a preprocessed face
+        Returns: {
+            'emotion': str,
+            'confidence': float,
+            'probabilities': dict,
+            'bbox': tuple
+        }
+        """
+        # Predict (replayed crops are served from the cache)
+        digest = None
+        predictions = None
+        if self.prediction_cache.enabled:
+            digest = PredictionCache.crop_digest(face_processed)
+            predictions = self.prediction_cache.get(self.model_version, digest)
+        
+        if predictions is None:
+            with metrics.time_stage("inference"):
+                predictions = self.predict_probabilities(face_processed)
+            if digest is not None:
+                self.prediction_cache.put(self.model_version, digest, predictions)
+        
+        # Get emotion
+        emotion_idx = np.argmax(predictions)
+        emotion = self.class_names[emotion_idx]
+        confidence = float(predictions[emotion_idx])
+        
+        # Create probabilities dict
+        probabilities = {
+            name: float(prob) 
+            for name, prob in zip(self.class_names, predictions)
+        }
+        
+        return {
+            'emotion': emotion,
+            'confidence': confidence,
+            'probabilities': probabilities,
+            'bbox': bbox
+        }
+    
+    def predict_emotion(self, image: np.ndarray) -> Optional[Dict]:
+        """
+        Detect face and predict emotion
+        Returns: classify_face() result or None if no face was found
+        """
+        face = self.extract_face(image)
+        if face is None:
+            return None
+        
+        bbox, face_processed = face
+        return self.classify_face(face_processed, bbox)
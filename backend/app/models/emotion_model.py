@@ -1,3 +1,5 @@
+import threading
+import time
 import cv2
 import numpy as np
 import tensorflow as tf
@@ -10,12 +12,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.config import config
+from app.models.base_detector import BaseDetector
+from app.utils.prediction_cache import file_signature
 
-class EmotionDetector:
+class EmotionDetector(BaseDetector):
+    name = "keras"
+    reloadable = True
+    
     def __init__(self):
         """Initialize the emotion detection model and face detector"""
+        super().__init__(model_path=config.MODEL_PATH)
+        
         print("🔄 Loading emotion model...")
-        self.model = tf.keras.models.load_model(str(config.MODEL_PATH))
+        self.model, self._model_version = self._load_model()
+        self._reload_lock = threading.Lock()
+        self._detect_lock = threading.Lock()  # MediaPipe graphs are not thread safe
         print("✅ Model loaded successfully")
         
         # Initialize MediaPipe Face Detection
@@ -24,8 +35,14 @@ class EmotionDetector:
             model_selection=0,
             min_detection_confidence=0.5
         )
-        
-        self.class_names = config.CLASS_NAMES
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None
+    
+    @property
+    def model_version(self) -> str:
+        return self._model_version
     
     def detect_face(self, image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
         """
@@ -33,7 +50,8 @@ class EmotionDetector:
         Returns: (x, y, w, h) or None
         """
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.face_detection.process(rgb_image)
+        with self._detect_lock:
+            results = self.face_detection.process(rgb_image)
         
         if not results.detections:
             return None
@@ -56,73 +74,60 @@ class EmotionDetector:
         
         return (x, y, width, height)
     
-    def preprocess_face(self, face_img: np.ndarray) -> np.ndarray:
-        """Preprocess face image for model input"""
-        # Resize to 48x48
-        face_resized = cv2.resize(face_img, config.IMG_SIZE)
-        
-        # Convert to grayscale
-        if len(face_resized.shape) == 3:
-            face_gray = cv2.cvtColor(face_resized, cv2.COLOR_BGR2GRAY)
-        else:
-            face_gray = face_resized
-        
-        # Normalize
-        face_normalized = face_gray / 255.0
-        
-        # Add batch and channel dimensions
-        face_processed = np.expand_dims(face_normalized, axis=-1)
-        face_processed = np.expand_dims(face_processed, axis=0)
-        
-        return face_processed
+    @staticmethod
+    def model_file() -> Path:
+        """Inference export if it is not older than the trained model, else MODEL_PATH"""
+        if config.PREFER_INFERENCE_MODEL:
+            exported = file_signature(config.INFERENCE_MODEL_PATH)
+            trained = file_signature(config.MODEL_PATH)
+            if exported and (trained is None or exported[0] >= trained[0]):
+                return config.INFERENCE_MODEL_PATH
+        return config.MODEL_PATH
     
-    def predict_emotion(self, image: np.ndarray) -> Optional[Dict]:
-        """
-        Detect face and predict emotion
-        Returns: {
-            'emotion': str,
-            'confidence': float,
-            'probabilities': dict,
-            'bbox': tuple
-        }
+    def _load_model(self) -> Tuple[tf.keras.Model, str]:
+        """Load the model file and run one warm-up prediction"""
+        path = self.model_file()
+        signature = file_signature(path)
+        print(f"   Model file: {path.name}")
+        model = tf.keras.models.load_model(str(path), compile=False)
+        
+        # The first predict builds the inference graph; do it before serving
+        warmup = np.zeros((1, config.IMG_SIZE[1], config.IMG_SIZE[0], 1), dtype=np.float32)
+        model.predict(warmup, verbose=0)
+        
+        version = f"{self.name}:{path.stem}:{signature[0]}:{signature[1]}" if signature else self.name
+        return model, version
+    
+    def reload_model(self) -> Dict:
         """
-        # Detect face
-        bbox = self.detect_face(image)
-        if bbox is None:
-            return None
-        
-        x, y, w, h = bbox
-        
-        # Extract face region
-        face_roi = image[y:y+h, x:x+w]
-        
-        if face_roi.size == 0:
-            return None
-        
-        # Preprocess
-        face_processed = self.preprocess_face(face_roi)
-        
-        # Predict
-        predictions = self.model.predict(face_processed, verbose=0)[0]
-        
-        # Get emotion
-        emotion_idx = np.argmax(predictions)
-        emotion = self.class_names[emotion_idx]
-        confidence = float(predictions[emotion_idx])
-        
-        # Create probabilities dict
-        probabilities = {
-            name: float(prob) 
-            for name, prob in zip(self.class_names, predictions)
-        }
+        Load and warm up the model file next to the serving one, then swap
         
+        The current model keeps serving until the new one is ready. The swap
+        is a single reference assignment, so every prediction runs entirely
+        on either the old or the new model. A file that fails to load leaves
+        the current model in place.
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            model, version = self._load_model()
+            load_seconds = time.perf_counter() - started
+            
+            previous = self._model_version
+            self.model, self._model_version = model, version
+            self.prediction_cache.invalidate()
+        
+        print(f"✅ Model reloaded ({previous} -> {version})")
         return {
-            'emotion': emotion,
-            'confidence': confidence,
-            'probabilities': probabilities,
-            'bbox': bbox
+            'previous_version': previous,
+            'version': version,
+            'load_seconds': round(load_seconds, 3)
         }
     
+    def predict_probabilities(self, face_processed: np.ndarray) -> np.ndarray:
+        """Run the Keras model on a preprocessed face batch"""
+        model = self.model  # May be swapped by reload_model() at any time
+        return model.predict(face_processed, verbose=0)[0]
+    
     def __del__(self):
         """Cleanup"""
         if hasattr(self, 'face_detection'):
@@ -0,0 +1,46 @@
+import time
+import zlib
+import numpy as np
+from typing import Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.models.base_detector import BaseDetector
+
+class FakeEmotionDetector(BaseDetector):
+    """
+    Deterministic stand-in for EmotionDetector
+    
+    Needs neither the trained model nor MediaPipe: the face is a fixed box in
+    the middle of the frame and probabilities are derived from the crop
+    pixels, so the same frame always yields the same prediction. Used for
+    load tests and CI throughput checks of the API, smoothing and risk layers.
+    """
+    
+    name = "fake"
+    
+    def __init__(self, inference_ms: float = None):
+        """
+        Args:
+            inference_ms: Simulated model latency (default from config)
+        """
+        super().__init__()
+        self.inference_seconds = (config.FAKE_INFERENCE_MS if inference_ms is None else inference_ms) / 1000
+    
+    def detect_face(self, image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """Central half of the frame"""
+        h, w = image.shape[:2]
+        return (w // 4, h // 4, w // 2, h // 2)
+    
+    def predict_probabilities(self, face_processed: np.ndarray) -> np.ndarray:
+        """Pseudo-random probabilities seeded by the crop content"""
+        if self.inference_seconds:
+            time.sleep(self.inference_seconds)
+        
+        seed = zlib.crc32(np.ascontiguousarray(face_processed).tobytes())
+        rng = np.random.default_rng(seed)
+        return rng.dirichlet(np.ones(len(self.class_names))).astype(np.float32)
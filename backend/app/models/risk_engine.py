@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import sys
 from pathlib import Path
 
@@ -9,12 +10,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from app.config import config
 
 class RiskEngine:
-    def __init__(self):
-        """Initialize risk calculation engine"""
-        self.fatigue_weight = config.FATIGUE_WEIGHT
-        self.stress_weight = config.STRESS_WEIGHT
-        self.duration_weight = config.DURATION_WEIGHT
-        self.risk_levels = config.RISK_LEVELS
+    def __init__(
+        self,
+        fatigue_weight: float = None,
+        stress_weight: float = None,
+        duration_weight: float = None,
+        risk_levels: Optional[Dict[str, Tuple[float, float]]] = None
+    ):
+        """
+        Initialize risk calculation engine
+        
+        Args:
+            fatigue_weight, stress_weight, duration_weight: Score weights
+                (default from config)
+            risk_levels: {level: (min score, max score)} (default from config)
+        """
+        self.fatigue_weight = config.FATIGUE_WEIGHT if fatigue_weight is None else fatigue_weight
+        self.stress_weight = config.STRESS_WEIGHT if stress_weight is None else stress_weight
+        self.duration_weight = config.DURATION_WEIGHT if duration_weight is None else duration_weight
+        self.risk_levels = config.RISK_LEVELS if risk_levels is None else risk_levels
     
     def calculate_risk_score(
         self, 
@@ -72,6 +86,15 @@ class RiskEngine:
                 return level
         return "normal"
     
+    def get_risk_levels(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorized _get_risk_level for an array of risk scores"""
+        scores = np.asarray(scores)
+        levels = np.full(scores.shape, "normal", dtype=object)
+        # Assign in reverse so the first matching level wins, as in _get_risk_level
+        for level, (min_val, max_val) in reversed(list(self.risk_levels.items())):
+            levels[(scores >= min_val) & (scores <= max_val)] = level
+        return levels
+    
     def calculate_batch_statistics(self, predictions: List[Dict]) -> Dict:
         """
         Calculate statistics from a batch of predictions
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+
+class RawPrediction(BaseModel):
+    emotion: str
+    confidence: float
+    probabilities: Dict[str, float]
+
+
+class SmoothedPrediction(BaseModel):
+    emotion: str
+    probabilities: Dict[str, float]
+
+
+class RiskAssessment(BaseModel):
+    risk_score: float
+    risk_level: str
+    fatigue_score: float
+    stress_score: float
+    duration_score: float
+
+
+class SessionInfo(BaseModel):
+    duration_minutes: float
+    frame_count: int
+    buffer_size: int
+
+
+class AnalyzeFrameResponse(BaseModel):
+    """Response of /api/analyze-frame (blocks may be omitted via `fields`)"""
+    status: str
+    timestamp: str
+    message: Optional[str] = None
+    raw_prediction: Optional[RawPrediction] = None
+    smoothed_prediction: Optional[SmoothedPrediction] = None
+    risk_assessment: Optional[RiskAssessment] = None
+    trend: Optional[str] = None
+    session_info: Optional[SessionInfo] = None
+    recommended_interval_ms: int
+
+
+class HistoryRow(BaseModel):
+    index: int
+    seq: int
+    timestamp: str
+    fatigue: float
+    stress: float
+    normal: float
+    emotion: str
+
+
+class HistoryResponse(BaseModel):
+    """Raw (non-bucketed) response of /api/analytics/history"""
+    status: str
+    count: int
+    incremental: bool
+    first_seq: int
+    last_seq: int
+    history: List[HistoryRow]
+
+
+class WhatIfConfig(BaseModel):
+    """Risk configuration to test (omitted fields keep the current value)"""
+    name: Optional[str] = None
+    fatigue_weight: Optional[float] = None
+    stress_weight: Optional[float] = None
+    duration_weight: Optional[float] = None
+    risk_levels: Optional[Dict[str, Tuple[float, float]]] = None
+
+
+class WhatIfRequest(BaseModel):
+    """Body of /api/analytics/whatif"""
+    configs: List[WhatIfConfig]
+    station_ids: Optional[List[str]] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    include_current: bool = True
@@ -0,0 +1,70 @@
+import threading
+from typing import Optional
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+
+class _InFlight:
+    __slots__ = ("_controller",)
+
+    def __init__(self, controller: "CaptureRateController"):
+        self._controller = controller
+
+    def __enter__(self):
+        with self._controller._lock:
+            self._controller._in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._controller._lock:
+            self._controller._in_flight -= 1
+        return False
+
+
+class CaptureRateController:
+    def __init__(self):
+        """
+        Recommends how long a station should wait before its next frame
+
+        Stable low-risk stations are slowed down and rising or high-risk ones
+        sped up, then everything is stretched when more frames are in flight
+        than the server is sized for, so fleet load drops while risky
+        stations keep their sampling rate relative to the rest.
+        """
+        self.base_ms = config.CAPTURE_INTERVAL_MS
+        self.min_ms = config.CAPTURE_MIN_INTERVAL_MS
+        self.max_ms = config.CAPTURE_MAX_INTERVAL_MS
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def track(self) -> _InFlight:
+        """Context manager counting a frame as in flight"""
+        return _InFlight(self)
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames currently being received or analyzed"""
+        return self._in_flight
+
+    def recommend(self, risk_level: Optional[str] = None, trend: Optional[str] = None) -> int:
+        """
+        Next capture interval in milliseconds
+
+        Args:
+            risk_level: Current risk level of the station (None if unknown)
+            trend: Result of TemporalSmoother.get_trend()
+        """
+        interval = self.base_ms
+        interval *= config.CAPTURE_LEVEL_FACTORS.get(risk_level, 1.0)
+        interval *= config.CAPTURE_TREND_FACTORS.get(trend, 1.0)
+
+        load = self._in_flight / config.CAPTURE_TARGET_QUEUE_DEPTH
+        if load > 1:
+            interval *= load
+
+        return int(min(self.max_ms, max(self.min_ms, interval)))
@@ -0,0 +1,91 @@
+import threading
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+
+class FrameChangeGate:
+    def __init__(self, threshold: float = None, max_reuse: int = None, enabled: bool = None):
+        """
+        Skip inference when a station's face crop has not visibly changed
+
+        Each preprocessed crop is reduced to a small thumbnail and compared
+        with the thumbnail of the last crop that went through the model. If
+        the mean absolute difference is below the threshold, the previous
+        prediction is reused. After max_reuse consecutive reuses the model
+        runs again so slow drift is still picked up.
+
+        Args:
+            threshold: Mean absolute pixel difference (0-1 scale) below which
+                       frames count as unchanged (default from config)
+            max_reuse: Consecutive reuses before inference is forced
+            enabled: Gate on/off (default from config)
+        """
+        self.threshold = config.CHANGE_GATE_THRESHOLD if threshold is None else threshold
+        self.max_reuse = config.CHANGE_GATE_MAX_REUSE if max_reuse is None else max_reuse
+        self.enabled = config.CHANGE_GATE_ENABLED if enabled is None else enabled
+        self.size = config.CHANGE_GATE_SIZE
+
+        # station_id -> [thumbnail, prediction, consecutive reuses]
+        self._last: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _thumbnail(self, face_processed: np.ndarray) -> np.ndarray:
+        face = np.asarray(face_processed, dtype=np.float32).reshape(config.IMG_SIZE[::-1])
+        return cv2.resize(face, self.size, interpolation=cv2.INTER_AREA)
+
+    def reuse(
+        self,
+        station_id: str,
+        face_processed: np.ndarray,
+        bbox: Tuple[int, int, int, int]
+    ) -> Optional[Dict]:
+        """
+        Get the previous prediction if the face is unchanged
+
+        Returns:
+            Copy of the last prediction (with the new bbox) or None if the
+            model has to run
+        """
+        if not self.enabled:
+            return None
+
+        thumbnail = self._thumbnail(face_processed)
+        with self._lock:
+            last = self._last.get(station_id)
+            if last is None or last[2] >= self.max_reuse:
+                return None
+            if float(np.mean(np.abs(thumbnail - last[0]))) >= self.threshold:
+                return None
+
+            last[2] += 1
+            prediction = dict(last[1])
+
+        prediction['bbox'] = bbox
+        return prediction
+
+    def update(self, station_id: str, face_processed: np.ndarray, prediction: Dict):
+        """Remember the crop and prediction of a frame that went through the model"""
+        if not self.enabled:
+            return
+
+        thumbnail = self._thumbnail(face_processed)
+        with self._lock:
+            self._last[station_id] = [thumbnail, dict(prediction), 0]
+
+    def reset(self, station_id: str):
+        """Forget the last crop of a station"""
+        with self._lock:
+            self._last.pop(station_id, None)
+
+    def clear(self):
+        """Forget every station (e.g. after the model changed)"""
+        with self._lock:
+            self._last.clear()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+from typing import Callable, Dict, Optional, Set
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+
+class _Subscriber:
+    def __init__(self, station_id: Optional[str]):
+        """One connected dashboard (station_id None = all stations)"""
+        self.station_id = station_id
+        self.pending: Dict[str, str] = {}
+        self.ready = asyncio.Event()
+
+    def wants(self, station_id: str) -> bool:
+        return self.station_id is None or self.station_id == station_id
+
+    def offer(self, station_id: str, data: str):
+        # Unsent data for the same station is replaced, so a slow client
+        # only ever receives the latest state
+        self.pending[station_id] = data
+        self.ready.set()
+
+
+class EventBroadcaster:
+    def __init__(self, summary_fn: Callable[[str], Optional[Dict]], interval: float = None):
+        """
+        Fan out risk/summary updates to server-sent event subscribers
+
+        The analyze path only records the latest update per station. Once per
+        interval the summary of each changed station is computed a single
+        time and pushed to every interested subscriber.
+
+        Args:
+            summary_fn: Builds the analytics summary of a station
+            interval: Seconds between broadcasts (default from config)
+        """
+        self.interval = interval or config.EVENT_INTERVAL
+        self._summary_fn = summary_fn
+        self._latest: Dict[str, Dict] = {}
+        self._lock = threading.Lock()  # publish() may be called from worker threads
+        self._subscribers: Set[_Subscriber] = set()
+        self._task = None
+
+    def start(self):
+        """Start the broadcast loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the broadcast loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def publish(self, station_id: str, update: Dict):
+        """Record the latest risk update of a station"""
+        with self._lock:
+            self._latest[station_id] = update
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.broadcast()
+
+    def broadcast(self):
+        """Push every update recorded since the last broadcast"""
+        with self._lock:
+            latest, self._latest = self._latest, {}
+
+        for station_id, update in latest.items():
+            interested = [s for s in self._subscribers if s.wants(station_id)]
+            if not interested:
+                continue
+
+            data = json.dumps({
+                "station_id": station_id,
+                "update": update,
+                "summary": self._summary_fn(station_id)
+            })
+            for subscriber in interested:
+                subscriber.offer(station_id, data)
+
+    async def stream(self, station_id: Optional[str] = None):
+        """
+        Async generator of SSE messages for one client
+
+        Args:
+            station_id: Only send updates of this station (None = all)
+        """
+        subscriber = _Subscriber(station_id)
+        self._subscribers.add(subscriber)
+
+        try:
+            yield f"retry: {config.EVENT_RETRY_MS}\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), timeout=config.EVENT_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                subscriber.ready.clear()
+                pending, subscriber.pending = subscriber.pending, {}
+                for data in pending.values():
+                    yield f"event: update\ndata: {data}\n\n"
+        finally:
+            self._subscribers.discard(subscriber)
@@ -0,0 +1,262 @@
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+# Fixed-width on-disk record (24 bytes, little endian)
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),   # Unix epoch seconds
+    ('fatigue', '<f4'),
+    ('stress', '<f4'),
+    ('normal', '<f4'),
+    ('risk_score', '<f4')
+])
+
+STATION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+def validate_station_id(station_id: str) -> str:
+    """Ensure a station id is safe to use as a file name"""
+    if not station_id or not STATION_ID_PATTERN.match(station_id) or station_id.startswith('.'):
+        raise ValueError(f"Invalid station id: {station_id!r}")
+    return station_id
+
+
+def to_epoch(value) -> Optional[float]:
+    """Convert a datetime (or epoch seconds) to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class HistoryStore:
+    def __init__(
+        self,
+        directory: Path = None,
+        flush_interval: float = None,
+        batch_size: int = None
+    ):
+        """
+        Append-only shift history log, one binary file per station
+
+        Records are buffered in memory and written in batches by a background
+        thread, so the request path never touches the disk. Each station file
+        is an array of RECORD_DTYPE rows sorted by timestamp, which lets range
+        queries memory-map the file and binary search the time column instead
+        of loading the whole history.
+
+        Args:
+            directory: Folder holding the station logs (default from config)
+            flush_interval: Seconds between background flushes
+            batch_size: Pending record count that triggers an early flush
+        """
+        self.directory = Path(directory or config.HISTORY_DIR)
+        self.flush_interval = flush_interval or config.HISTORY_FLUSH_INTERVAL
+        self.batch_size = batch_size or config.HISTORY_BATCH_SIZE
+
+        self._pending: Dict[str, List[tuple]] = defaultdict(list)
+        self._pending_count = 0
+        self._last_timestamp: Dict[str, float] = {}
+
+        self._lock = threading.Lock()        # Guards the pending buffers
+        self._write_lock = threading.Lock()  # Serializes file appends
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _path(self, station_id: str) -> Path:
+        return self.directory / f"{station_id}.bin"
+
+    def start(self):
+        """Open the log directory and start the background writer"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._repair()
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="history-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background writer and flush remaining records"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _repair(self):
+        """Drop torn trailing records left by an interrupted write"""
+        itemsize = RECORD_DTYPE.itemsize
+        for path in self.directory.glob("*.bin"):
+            size = path.stat().st_size
+            if size % itemsize:
+                with open(path, 'r+b') as f:
+                    f.truncate(size - size % itemsize)
+
+            count = path.stat().st_size // itemsize
+            if count:
+                last = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=(count - 1) * itemsize, shape=(1,))
+                self._last_timestamp[path.stem] = float(last['timestamp'][0])
+
+    def append(
+        self,
+        station_id: str,
+        timestamp,
+        probabilities: Dict[str, float],
+        risk_score: float
+    ) -> float:
+        """
+        Queue a prediction for the next batch write
+
+        Returns:
+            The stored timestamp in epoch seconds
+        """
+        ts = to_epoch(timestamp)
+
+        with self._lock:
+            # Keep each station log sorted even if the wall clock steps back
+            ts = max(ts, self._last_timestamp.get(station_id, ts))
+            self._last_timestamp[station_id] = ts
+
+            self._pending[station_id].append((
+                ts,
+                probabilities.get('Fatigue', 0),
+                probabilities.get('Stress', 0),
+                probabilities.get('Normal', 0),
+                risk_score
+            ))
+            self._pending_count += 1
+
+            if self._pending_count >= self.batch_size:
+                self._wake.set()
+
+        return ts
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all pending records to disk"""
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = defaultdict(list)
+                self._pending_count = 0
+
+            for station_id, records in pending.items():
+                block = np.array(records, dtype=RECORD_DTYPE)
+                with open(self._path(station_id), 'ab') as f:
+                    f.write(block.tobytes())
+
+    def _snapshot(self, station_id: str):
+        """Return (row count on disk, copy of pending rows) for a station"""
+        path = self._path(station_id)
+        with self._write_lock:
+            count = path.stat().st_size // RECORD_DTYPE.itemsize if path.exists() else 0
+            with self._lock:
+                pending = list(self._pending.get(station_id, ()))
+        return count, np.array(pending, dtype=RECORD_DTYPE)
+
+    def _open(self, station_id: str, count: int) -> np.ndarray:
+        return np.memmap(self._path(station_id), dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def query(self, station_id: str, start=None, end=None, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Return the records of a station within [start, end]
+
+        Args:
+            station_id: Station to read
+            start: Inclusive lower bound (datetime or epoch seconds)
+            end: Inclusive upper bound (datetime or epoch seconds)
+            limit: Only the newest `limit` records of the range; the offsets
+                   are found by binary search, so only those rows are read
+
+        Returns:
+            Structured array with RECORD_DTYPE fields
+        """
+        start, end = to_epoch(start), to_epoch(end)
+        count, pending = self._snapshot(station_id)
+
+        # Pending rows are the newest, so they are taken first under a limit
+        if len(pending):
+            mask = np.ones(len(pending), dtype=bool)
+            if start is not None:
+                mask &= pending['timestamp'] >= start
+            if end is not None:
+                mask &= pending['timestamp'] <= end
+            pending = pending[mask]
+            if limit is not None:
+                pending = pending[max(0, len(pending) - limit):]
+
+        parts = []
+        if count and (limit is None or len(pending) < limit):
+            records = self._open(station_id, count)
+            timestamps = records['timestamp']
+            lo = int(np.searchsorted(timestamps, start, side='left')) if start is not None else 0
+            hi = int(np.searchsorted(timestamps, end, side='right')) if end is not None else count
+            if limit is not None:
+                lo = max(lo, hi - (limit - len(pending)))
+            if hi > lo:
+                parts.append(np.array(records[lo:hi]))
+
+        if len(pending):
+            parts.append(pending)
+
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(parts)
+
+    def iter_query(self, station_id: str, start=None, end=None, chunk_size: int = None) -> Iterator[np.ndarray]:
+        """
+        Like query(), but yields the records in chunks of at most chunk_size
+
+        Only one chunk is copied out of the memory-mapped file at a time, so
+        arbitrarily long ranges can be streamed.
+        """
+        chunk_size = chunk_size or config.EXPORT_CHUNK_ROWS
+        start, end = to_epoch(start), to_epoch(end)
+        count, pending = self._snapshot(station_id)
+
+        if count:
+            records = self._open(station_id, count)
+            timestamps = records['timestamp']
+            lo = int(np.searchsorted(timestamps, start, side='left')) if start is not None else 0
+            hi = int(np.searchsorted(timestamps, end, side='right')) if end is not None else count
+            for offset in range(lo, hi, chunk_size):
+                yield np.array(records[offset:min(offset + chunk_size, hi)])
+
+        if len(pending):
+            mask = np.ones(len(pending), dtype=bool)
+            if start is not None:
+                mask &= pending['timestamp'] >= start
+            if end is not None:
+                mask &= pending['timestamp'] <= end
+            if mask.any():
+                yield pending[mask]
+
+    def stations(self) -> List[str]:
+        """List every station with recorded history"""
+        names = set()
+        if self.directory.exists():
+            names.update(path.stem for path in self.directory.glob("*.bin"))
+        with self._lock:
+            names.update(self._pending.keys())
+        return sorted(names)
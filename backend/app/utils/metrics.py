@@ -0,0 +1,238 @@
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_NULL_TIMER = nullcontext()
+
+
+def _format_labels(label_name: Optional[str], label: Optional[str], extra: str = "") -> str:
+    parts = []
+    if label_name is not None and label is not None:
+        parts.append(f'{label_name}="{label}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_name: Optional[str] = None):
+        """Monotonically increasing count, optionally split by one label"""
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        # Unlabeled counters are exported as 0 before the first increment
+        self._values: Dict[Optional[str], float] = {} if label_name else {None: 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, label: Optional[str] = None):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + amount
+
+    def value(self, label: Optional[str] = None) -> float:
+        return self._values.get(label, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label, value in sorted(self._values.items(), key=lambda item: str(item[0])):
+                lines.append(f"{self.name}{_format_labels(self.label_name, label)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, callback: Callable[[], float]):
+        """Point-in-time value read from a callback at scrape time"""
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {float(self.callback())}"
+        ]
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_name: Optional[str] = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """Distribution of observed values, optionally split by one label"""
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Optional[str], List] = {}  # label -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label: Optional[str] = None):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[label] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label, (counts, total, count) in sorted(self._series.items(), key=lambda item: str(item[0])):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.label_name, label, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_name, label)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class RateMeter:
+    def __init__(self, window: int = 10):
+        """Events per second over a sliding window of one-second slots"""
+        self.window = window
+        self._slots = [0] * window
+        self._slot_times = [0] * window
+        self._lock = threading.Lock()
+
+    def mark(self, now: float = None):
+        second = int(now if now is not None else time.time())
+        slot = second % self.window
+        with self._lock:
+            if self._slot_times[slot] != second:
+                self._slot_times[slot] = second
+                self._slots[slot] = 0
+            self._slots[slot] += 1
+
+    def rate(self, now: float = None) -> float:
+        second = int(now if now is not None else time.time())
+        with self._lock:
+            # Only count complete seconds still inside the window
+            total = sum(
+                count for count, slot_time in zip(self._slots, self._slot_times)
+                if second - self.window <= slot_time < second
+            )
+        return total / self.window
+
+
+class _StageTimer:
+    __slots__ = ("_histogram", "_stage", "_start")
+
+    def __init__(self, histogram: Histogram, stage: str):
+        self._histogram = histogram
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, self._stage)
+        return False
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = None):
+        """
+        Process-wide metrics in the Prometheus text exposition format
+
+        When disabled, timers are a shared no-op context manager and counters
+        are not touched, so instrumentation costs a single attribute check.
+        """
+        self.enabled = config.METRICS_ENABLED if enabled is None else enabled
+        self._metrics: List = []
+
+        self.stage_latency = self.histogram(
+            "fatigue_stage_latency_seconds",
+            "Latency of each stage of the analyze path",
+            label_name="stage"
+        )
+        self.frames = self.counter("fatigue_frames_total", "Frames received for analysis")
+        self.no_face = self.counter("fatigue_no_face_total", "Frames in which no face was detected")
+        self.inference_skipped = self.counter(
+            "fatigue_inference_skipped_total",
+            "Frames whose prediction was reused because the face crop did not change"
+        )
+        self.prediction_cache = self.counter(
+            "fatigue_prediction_cache_total",
+            "Prediction cache lookups by result",
+            label_name="result"
+        )
+        self.gauge("fatigue_inference_skip_ratio", "Share of frames with a face that skipped inference", self._skip_ratio)
+        self.frame_rate = RateMeter()
+        self.gauge("fatigue_frames_per_second", "Frames analyzed per second (10 s window)", self.frame_rate.rate)
+
+    def counter(self, name: str, help_text: str, label_name: Optional[str] = None) -> Counter:
+        metric = Counter(name, help_text, label_name)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> Gauge:
+        metric = Gauge(name, help_text, callback)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, label_name: Optional[str] = None) -> Histogram:
+        metric = Histogram(name, help_text, label_name)
+        self._metrics.append(metric)
+        return metric
+
+    def time_stage(self, stage: str):
+        """Context manager recording the latency of one analyze stage"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.stage_latency, stage)
+
+    def count_frame(self, face_found: bool):
+        """Record one analyzed frame"""
+        if not self.enabled:
+            return
+        self.frames.inc()
+        self.frame_rate.mark()
+        if not face_found:
+            self.no_face.inc()
+
+    def count_skipped(self):
+        """Record a frame answered without running the model"""
+        if self.enabled:
+            self.inference_skipped.inc()
+
+    def count_prediction_cache(self, hit: bool):
+        """Record one prediction cache lookup"""
+        if self.enabled:
+            self.prediction_cache.inc(label="hit" if hit else "miss")
+
+    def _skip_ratio(self) -> float:
+        with_face = self.frames.value() - self.no_face.value()
+        return self.inference_skipped.value() / with_face if with_face else 0.0
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,94 @@
+import threading
+from typing import Callable, Dict, List, Optional
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.utils.prediction_cache import file_signature
+
+
+class ModelWatcher:
+    def __init__(self, paths: List[Path], reload_fn: Callable[[], Dict], interval: float = None):
+        """
+        Reload the model when its files are replaced
+
+        The files are polled from a background thread. A new signature
+        (mtime, size) must stay the same for one more interval before
+        reloading, so a model that is still being written by train_model.py
+        is not picked up half way.
+
+        Args:
+            paths: Model files to watch (trained model and inference export)
+            reload_fn: Loads and swaps in the model (detector.reload_model)
+            interval: Seconds between checks (default from config)
+        """
+        self.paths = [Path(path) for path in paths]
+        self.reload_fn = reload_fn
+        self.interval = interval or config.MODEL_WATCH_INTERVAL
+
+        self.last_reload: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+
+        self._signature = self._read_signature()
+        self._candidate = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling the model files"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def _read_signature(self):
+        return tuple(file_signature(path) for path in self.paths)
+
+    def check(self) -> bool:
+        """Reload if a file changed and has settled; returns True on reload"""
+        signature = self._read_signature()
+        if not any(signature) or signature == self._signature:
+            self._candidate = None
+            return False
+
+        if signature != self._candidate:
+            # Changed since the last check, wait until writes stop
+            self._candidate = signature
+            return False
+
+        self._signature = signature
+        self._candidate = None
+        return self.reload() is not None
+
+    def reload(self) -> Optional[Dict]:
+        """Reload now, recording the outcome instead of raising"""
+        try:
+            self.last_reload = self.reload_fn()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Model reload failed: {e}")
+            return None
+        return self.last_reload
+
+    def status(self) -> Dict:
+        return {
+            'watching': self._thread is not None,
+            'paths': [str(path) for path in self.paths],
+            'last_reload': self.last_reload,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.utils.metrics import metrics
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime in ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PredictionCache:
+    def __init__(
+        self,
+        max_entries: int = None,
+        watch_path: Path = None,
+        check_interval: float = None
+    ):
+        """
+        Bounded LRU cache of class probabilities per preprocessed face crop
+
+        Keys are a digest of the crop (quantized back to 8-bit pixels, so the
+        float normalization does not matter) plus the model version, so a
+        replayed or retried frame skips inference. If watch_path is given, the
+        file is stat'ed at most once per check_interval and the whole cache is
+        dropped when it changes.
+
+        Args:
+            max_entries: Maximum cached crops, 0 disables (default from config)
+            watch_path: Model file whose changes invalidate the cache
+            check_interval: Seconds between model file checks
+        """
+        self.max_entries = config.PREDICTION_CACHE_SIZE if max_entries is None else max_entries
+        self.watch_path = watch_path
+        self.check_interval = config.PREDICTION_CACHE_CHECK_INTERVAL if check_interval is None else check_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._entries: "OrderedDict[Tuple[str, bytes], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = file_signature(watch_path) if watch_path else None
+        self._next_check = time.monotonic() + self.check_interval
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def crop_digest(face_processed: np.ndarray) -> bytes:
+        """Content hash of a preprocessed (0-1 normalized) face crop"""
+        pixels = np.rint(np.asarray(face_processed) * 255).astype(np.uint8)
+        return hashlib.blake2b(pixels.tobytes(), digest_size=16).digest()
+
+    def get(self, model_version: str, digest: bytes) -> Optional[np.ndarray]:
+        """Cached probabilities of a crop (None on a miss)"""
+        if not self.enabled:
+            return None
+
+        self._check_model_file()
+        key = (model_version, digest)
+        with self._lock:
+            probabilities = self._entries.get(key)
+            if probabilities is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        metrics.count_prediction_cache(hit=probabilities is not None)
+        return probabilities
+
+    def put(self, model_version: str, digest: bytes, probabilities: np.ndarray):
+        """Store the probabilities of a crop, evicting the least recently used"""
+        if not self.enabled:
+            return
+
+        # Cached arrays are shared between callers, so freeze a private copy
+        probabilities = np.array(probabilities, copy=True)
+        probabilities.flags.writeable = False
+
+        with self._lock:
+            self._entries[(model_version, digest)] = probabilities
+            self._entries.move_to_end((model_version, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every cached prediction (call when the model changes)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _check_model_file(self):
+        if self.watch_path is None:
+            return
+
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+
+        signature = file_signature(self.watch_path)
+        if signature != self._signature:
+            self._signature = signature
+            self.invalidate()
+
+    def stats(self) -> Dict:
+        """Size and hit/miss counts"""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,179 @@
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+_NULL_PROFILE = nullcontext()
+
+
+class _ProfiledCall:
+    __slots__ = ("_profiler", "_profile")
+
+    def __init__(self, profiler: "SamplingProfiler"):
+        self._profiler = profiler
+        self._profile = cProfile.Profile()
+
+    def __enter__(self):
+        self._profiler._active_thread = threading.get_ident()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        self._profiler._active_thread = None
+        self._profiler._record(self._profile)
+        self._profiler._busy.release()
+        return False
+
+
+class SamplingProfiler:
+    def __init__(self, enabled: bool = None, every: int = None, stack_interval: float = None):
+        """
+        Opt-in profiler for a sample of analyze calls
+
+        Every Nth call runs under cProfile, and while it runs a background
+        thread samples its Python stack. Results accumulate in memory until
+        reset: cProfile statistics (pstats-compatible dump) and collapsed
+        stacks ready for flamegraph tools.
+
+        Args:
+            enabled: Start profiling immediately (default from config)
+            every: Profile one call out of this many
+            stack_interval: Seconds between stack samples
+        """
+        self.enabled = False
+        self.every = every or config.PROFILE_SAMPLE_EVERY
+        self.stack_interval = stack_interval or config.PROFILE_STACK_INTERVAL
+
+        self._calls = 0
+        self._profiled_calls = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._stacks = Counter()
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()  # Only one profiled call at a time
+        self._active_thread: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if config.PROFILING_ENABLED if enabled is None else enabled:
+            self.enable()
+
+    def enable(self, every: int = None):
+        """Start sampling calls"""
+        if every:
+            self.every = every
+        self.enabled = True
+
+        if self._sampler is None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_stacks, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def disable(self):
+        """Stop sampling calls (collected results are kept)"""
+        self.enabled = False
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def reset(self):
+        """Drop collected results"""
+        with self._lock:
+            self._calls = 0
+            self._profiled_calls = 0
+            self._stats = None
+            self._stacks.clear()
+
+    def sample(self):
+        """Context manager profiling the wrapped call if it is sampled"""
+        if not self.enabled:
+            return _NULL_PROFILE
+
+        self._calls += 1
+        if self._calls % self.every:
+            return _NULL_PROFILE
+
+        # Skip rather than wait if another call is being profiled
+        if not self._busy.acquire(blocking=False):
+            return _NULL_PROFILE
+        return _ProfiledCall(self)
+
+    def _record(self, profile: cProfile.Profile):
+        with self._lock:
+            self._profiled_calls += 1
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+
+    def _sample_stacks(self):
+        while not self._stop.wait(self.stack_interval):
+            thread_id = self._active_thread
+            if thread_id is None:
+                continue
+
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+
+            if stack:
+                with self._lock:
+                    self._stacks[";".join(reversed(stack))] += 1
+
+    def summary(self, limit: int = 25) -> Dict:
+        """Status and the most expensive functions by cumulative time"""
+        with self._lock:
+            top: List[Dict] = []
+            if self._stats is not None:
+                entries = sorted(self._stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+                for (filename, line, function), (_, calls, total, cumulative, _) in entries[:limit]:
+                    top.append({
+                        'function': f"{Path(filename).name}:{line}({function})",
+                        'calls': calls,
+                        'total_time_ms': round(total * 1000, 3),
+                        'cumulative_time_ms': round(cumulative * 1000, 3)
+                    })
+
+            return {
+                'enabled': self.enabled,
+                'every': self.every,
+                'calls_seen': self._calls,
+                'calls_profiled': self._profiled_calls,
+                'stack_samples': sum(self._stacks.values()),
+                'top_functions': top
+            }
+
+    def collapsed_stacks(self) -> str:
+        """Stack samples in the collapsed format (flamegraph.pl, speedscope)"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def pstats_dump(self) -> bytes:
+        """cProfile statistics in the format written by pstats.Stats.dump_stats"""
+        with self._lock:
+            return marshal.dumps(self._stats.stats if self._stats is not None else {})
+
+    def text_report(self, limit: int = 50) -> str:
+        """Human readable pstats report sorted by cumulative time"""
+        with self._lock:
+            if self._stats is None:
+                return "No calls profiled yet\n"
+            out = io.StringIO()
+            self._stats.stream = out
+            self._stats.sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
@@ -0,0 +1,145 @@
+import csv
+import io
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.models.risk_engine import RiskEngine
+from app.utils.history_store import HistoryStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+CSV_HEADER = ["station_id", "timestamp", "epoch", "fatigue", "stress", "normal", "risk_score", "risk_level"]
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def iter_history_chunks(
+    store: HistoryStore,
+    station_ids: Sequence[str],
+    start=None,
+    end=None,
+    risk_levels: Optional[Sequence[str]] = None,
+    chunk_size: int = None
+) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Yield (station_id, records, risk levels) chunks matching the filters
+
+    Risk levels are derived from the stored risk score with the configured
+    thresholds, one chunk at a time.
+    """
+    engine = RiskEngine()
+    for station_id in station_ids:
+        for records in store.iter_query(station_id, start, end, chunk_size):
+            levels = engine.get_risk_levels(records['risk_score'])
+            if risk_levels:
+                keep = np.isin(levels, list(risk_levels))
+                records, levels = records[keep], levels[keep]
+            if len(records):
+                yield station_id, records, levels
+
+
+def _percent(values: np.ndarray) -> List[float]:
+    return np.round(values.astype(np.float64) * 100, 2).tolist()
+
+
+def csv_stream(chunks: Iterator[Tuple[str, np.ndarray, np.ndarray]]) -> Iterator[bytes]:
+    """Encode history chunks as CSV, one block of bytes per chunk (timestamps in UTC, like Parquet)"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(CSV_HEADER)
+    yield out.getvalue().encode()
+
+    for station_id, records, levels in chunks:
+        out.seek(0)
+        out.truncate()
+        epochs = records['timestamp'].tolist()
+        writer.writerows(zip(
+            repeat(station_id),
+            (datetime.fromtimestamp(ts, timezone.utc).isoformat() for ts in epochs),
+            epochs,
+            _percent(records['fatigue']),
+            _percent(records['stress']),
+            _percent(records['normal']),
+            np.round(records['risk_score'].astype(np.float64), 2).tolist(),
+            levels.tolist()
+        ))
+        yield out.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object handing out whatever was written since the last drain"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def parquet_stream(chunks: Iterator[Tuple[str, np.ndarray, np.ndarray]]) -> Iterator[bytes]:
+    """Encode history chunks as Parquet, one row group per chunk"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = pa.schema([
+        ("station_id", pa.dictionary(pa.int32(), pa.string())),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("fatigue", pa.float32()),
+        ("stress", pa.float32()),
+        ("normal", pa.float32()),
+        ("risk_score", pa.float32()),
+        ("risk_level", pa.dictionary(pa.int8(), pa.string()))
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    try:
+        for station_id, records, levels in chunks:
+            table = pa.table({
+                "station_id": pa.DictionaryArray.from_arrays(
+                    np.zeros(len(records), dtype=np.int32), pa.array([station_id])
+                ),
+                "timestamp": pa.array((records['timestamp'] * 1e6).astype(np.int64), schema.field("timestamp").type),
+                "fatigue": records['fatigue'] * 100,
+                "stress": records['stress'] * 100,
+                "normal": records['normal'] * 100,
+                "risk_score": records['risk_score'],
+                "risk_level": pa.array(levels.tolist(), pa.string()).dictionary_encode().cast(schema.field("risk_level").type)
+            }, schema=schema)
+            writer.write_table(table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,126 @@
+import bisect
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+
+class RiskLeaderboard:
+    def __init__(self, stale_after: float = None):
+        """
+        Fleet-wide index of stations ordered by current smoothed risk
+
+        Stations are kept in a list sorted by descending risk score, updated
+        by binary search on every analyzed frame, so the riskiest K stations
+        are read from the front without scanning the fleet. Entries are also
+        kept in update order, so stale stations are expired from the oldest
+        end on every update and read.
+
+        Args:
+            stale_after: Seconds without frames before a station drops out
+                         of the leaderboard (default from config)
+        """
+        self.stale_after = stale_after or config.FLEET_STALE_AFTER
+        self._order: List[Tuple[float, str]] = []  # (-risk_score, station_id)
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()  # Oldest update first
+        self._level_counts = Counter()
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        station_id: str,
+        risk_score: float,
+        risk_level: str,
+        trend: Optional[str] = None,
+        timestamp: float = None
+    ):
+        """Set the current risk of a station"""
+        with self._lock:
+            self._remove(station_id)
+            self._expire()
+
+            entry = {
+                'station_id': station_id,
+                'risk_score': risk_score,
+                'risk_level': risk_level,
+                'trend': trend,
+                'updated': timestamp if timestamp is not None else time.time()
+            }
+            self._entries[station_id] = entry
+            self._level_counts[risk_level] += 1
+            bisect.insort(self._order, (-risk_score, station_id))
+
+    def get(self, station_id: str) -> Optional[Dict]:
+        """Current entry of a station (None if not tracked)"""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(station_id)
+            return dict(entry) if entry else None
+
+    def remove(self, station_id: str):
+        """Drop a station from the leaderboard"""
+        with self._lock:
+            self._remove(station_id)
+
+    def _remove(self, station_id: str):
+        entry = self._entries.pop(station_id, None)
+        if entry is None:
+            return
+
+        key = (-entry['risk_score'], station_id)
+        index = bisect.bisect_left(self._order, key)
+        del self._order[index]
+
+        self._level_counts[entry['risk_level']] -= 1
+        if not self._level_counts[entry['risk_level']]:
+            del self._level_counts[entry['risk_level']]
+
+    def _expire(self, now: float = None):
+        """Drop stations without updates for stale_after seconds (oldest first)"""
+        cutoff = (now if now is not None else time.time()) - self.stale_after
+        while self._entries:
+            station_id, entry = next(iter(self._entries.items()))
+            if entry['updated'] >= cutoff:
+                break
+            self._remove(station_id)
+
+    def top(self, k: int, risk_level: Optional[str] = None, now: float = None) -> List[Dict]:
+        """
+        Get the K highest-risk active stations
+
+        Args:
+            k: Number of stations to return
+            risk_level: Only return stations at this level
+            now: Reference time for staleness (default current time)
+        """
+        result = []
+
+        with self._lock:
+            self._expire(now)
+            for _, station_id in self._order:
+                if len(result) >= k:
+                    break
+
+                entry = self._entries[station_id]
+                if risk_level is None or entry['risk_level'] == risk_level:
+                    result.append(dict(entry))
+
+        return result
+
+    def level_counts(self) -> Dict[str, int]:
+        """Number of active stations per risk level"""
+        with self._lock:
+            self._expire()
+            return dict(self._level_counts)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
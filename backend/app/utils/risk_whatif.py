@@ -0,0 +1,258 @@
+import argparse
+import itertools
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.models.risk_engine import RiskEngine
+from app.utils.history_store import HistoryStore
+
+
+def session_features(
+    records: np.ndarray,
+    session_gap: float = None,
+    window: int = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rebuild the inputs of the live risk score for a station's history
+
+    The log has no session resets, so a gap longer than session_gap starts a
+    new session. Within a session, fatigue and stress are averaged over the
+    last `window` rows (as TemporalSmoother does) and the duration counts
+    whole minutes since the first row.
+
+    Returns:
+        (smoothed fatigue, smoothed stress, duration score, session start flags)
+    """
+    session_gap = session_gap or config.WHATIF_SESSION_GAP
+    window = window or config.SMOOTHING_WINDOW
+
+    timestamps = records['timestamp'].astype(np.float64)
+    index = np.arange(len(records))
+
+    starts = np.ones(len(records), dtype=bool)
+    starts[1:] = np.diff(timestamps) > session_gap
+    session_start = np.maximum.accumulate(np.where(starts, index, 0))
+
+    # Moving average over the last `window` rows of the same session
+    window_start = np.maximum(session_start, index - window + 1)
+    counts = index + 1 - window_start
+
+    def smooth(values: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        return (cumulative[index + 1] - cumulative[window_start]) / counts
+
+    duration_minutes = np.floor((timestamps - timestamps[session_start]) / 60)
+    duration_score = np.minimum(100, duration_minutes / 480 * 100)
+
+    return smooth(records['fatigue']), smooth(records['stress']), duration_score, starts
+
+
+class WhatIfScorer:
+    def __init__(self, engines: Sequence[RiskEngine], chunk_rows: int = None):
+        """
+        Score histories under many risk configurations at once
+
+        All configurations are evaluated together: scores are one matrix
+        product (configs x rows) and levels one broadcast comparison against
+        every configuration's thresholds, processed chunk_rows rows at a time
+        to bound memory.
+
+        Args:
+            engines: One RiskEngine per configuration; risk_levels must use the
+                     level names of config.RISK_LEVELS
+            chunk_rows: Rows scored per step (default from config)
+
+        Raises:
+            ValueError: If an engine uses other level names
+        """
+        self.level_names = list(config.RISK_LEVELS)
+        for engine in engines:
+            if set(engine.risk_levels) != set(self.level_names):
+                raise ValueError(f"risk_levels must define exactly: {', '.join(self.level_names)}")
+
+        self.engines = list(engines)
+        self.chunk_rows = chunk_rows or config.WHATIF_CHUNK_ROWS
+
+        self.weights = np.array(
+            [[e.fatigue_weight, e.stress_weight, e.duration_weight] for e in self.engines],
+            dtype=np.float64
+        )
+        self.level_min = np.array([[e.risk_levels[l][0] for l in self.level_names] for e in self.engines], dtype=np.float64)
+        self.level_max = np.array([[e.risk_levels[l][1] for l in self.level_names] for e in self.engines], dtype=np.float64)
+        self.default_level = self.level_names.index("normal")
+
+        configs, levels = len(self.engines), len(self.level_names)
+        self.rows = 0
+        self.sessions = 0
+        self.level_counts = np.zeros((configs, levels), dtype=np.int64)
+        self.transitions = np.zeros((configs, levels, levels), dtype=np.int64)
+        self.score_sum = np.zeros(configs)
+        self.score_max = np.full(configs, -np.inf)
+
+    def levels(self, scores: np.ndarray) -> np.ndarray:
+        """Level index per (config, row), first matching level as in RiskEngine"""
+        result = np.full(scores.shape, self.default_level, dtype=np.int8)
+        # Assign in reverse so the first matching level wins
+        for j in reversed(range(len(self.level_names))):
+            match = (scores >= self.level_min[:, j, None]) & (scores <= self.level_max[:, j, None])
+            result[match] = j
+        return result
+
+    def add_station(self, records: np.ndarray):
+        """Score one station's history (rows sorted by time)"""
+        if not len(records):
+            return
+
+        fatigue, stress, duration_score, starts = session_features(records)
+        levels = len(self.level_names)
+        previous = None
+
+        for lo in range(0, len(records), self.chunk_rows):
+            hi = min(lo + self.chunk_rows, len(records))
+            features = np.stack([fatigue[lo:hi] * 100, stress[lo:hi] * 100, duration_score[lo:hi]])
+
+            scores = self.weights @ features  # (configs, rows)
+            chunk_levels = self.levels(scores)
+
+            self.score_sum += scores.sum(axis=1)
+            self.score_max = np.maximum(self.score_max, scores.max(axis=1))
+            for j in range(levels):
+                self.level_counts[:, j] += np.count_nonzero(chunk_levels == j, axis=1)
+
+            # Level changes between consecutive rows of the same session,
+            # encoded as from * levels + to (small ints, one pass per pair)
+            sequence = chunk_levels if previous is None else np.hstack([previous[:, None], chunk_levels])
+            same_session = ~starts[hi - sequence.shape[1] + 1:hi]
+            codes = sequence[:, :-1][:, same_session] * levels + sequence[:, 1:][:, same_session]
+            for i in range(levels):
+                for j in range(levels):
+                    if i != j:
+                        self.transitions[:, i, j] += np.count_nonzero(codes == i * levels + j, axis=1)
+
+            previous = chunk_levels[:, -1]
+
+        self.rows += len(records)
+        self.sessions += int(starts.sum())
+
+    def results(self, names: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Per-configuration level counts and transition counts"""
+        names = names or [f"config_{i}" for i in range(len(self.engines))]
+        results = []
+
+        for k, engine in enumerate(self.engines):
+            transitions = {}
+            escalations = 0
+            for i, source in enumerate(self.level_names):
+                for j, target in enumerate(self.level_names):
+                    if i != j:
+                        transitions[f"{source}->{target}"] = int(self.transitions[k, i, j])
+                        if j > i:
+                            escalations += int(self.transitions[k, i, j])
+
+            results.append({
+                'name': names[k],
+                'fatigue_weight': engine.fatigue_weight,
+                'stress_weight': engine.stress_weight,
+                'duration_weight': engine.duration_weight,
+                'risk_levels': {level: list(engine.risk_levels[level]) for level in self.level_names},
+                'rows_per_level': dict(zip(self.level_names, self.level_counts[k].tolist())),
+                'transitions': transitions,
+                'total_transitions': sum(transitions.values()),
+                'escalations': escalations,
+                'mean_score': round(float(self.score_sum[k] / self.rows), 2) if self.rows else None,
+                'max_score': round(float(self.score_max[k]), 2) if self.rows else None
+            })
+        return results
+
+
+def run_whatif(
+    store: HistoryStore,
+    engines: Sequence[RiskEngine],
+    names: Optional[Sequence[str]] = None,
+    station_ids: Optional[Sequence[str]] = None,
+    start=None,
+    end=None
+) -> Dict:
+    """
+    Re-score stored history of the given stations under every configuration
+
+    Args:
+        store: Shift history log
+        engines: One RiskEngine per configuration
+        names: Label of each configuration
+        station_ids: Stations to include (default: all recorded)
+        start: Inclusive lower time bound
+        end: Inclusive upper time bound
+    """
+    started = time.perf_counter()
+    scorer = WhatIfScorer(engines)
+    station_ids = list(station_ids or store.stations())
+
+    for station_id in station_ids:
+        scorer.add_station(store.query(station_id, start, end))
+
+    return {
+        'status': 'success',
+        'stations': station_ids,
+        'rows': scorer.rows,
+        'sessions': scorer.sessions,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'configs': scorer.results(names)
+    }
+
+
+def threshold_levels(warning_from: float, critical_from: float) -> Dict[str, Tuple[float, float]]:
+    """RISK_LEVELS-style bounds from the scores at which warning and critical start"""
+    return {
+        "normal": (0, warning_from - 1),
+        "warning": (warning_from, critical_from - 1),
+        "critical": (critical_from, 100)
+    }
+
+
+def _floats(text: str) -> List[float]:
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-score stored shift history under a grid of risk weights and thresholds"
+    )
+    parser.add_argument('--fatigue-weights', type=_floats, default=[config.FATIGUE_WEIGHT], help="e.g. 0.4,0.5,0.6")
+    parser.add_argument('--stress-weights', type=_floats, default=[config.STRESS_WEIGHT])
+    parser.add_argument('--duration-weights', type=_floats, default=[config.DURATION_WEIGHT])
+    parser.add_argument('--warning-from', type=_floats, default=[config.RISK_LEVELS['warning'][0]], help="Score where warning starts")
+    parser.add_argument('--critical-from', type=_floats, default=[config.RISK_LEVELS['critical'][0]], help="Score where critical starts")
+    parser.add_argument('--station', action='append', help="Station to include (repeatable, default all)")
+    parser.add_argument('--history-dir', default=str(config.HISTORY_DIR))
+    parser.add_argument('--output', help="Write the full JSON result here")
+    args = parser.parse_args()
+
+    engines, names = [RiskEngine()], ["current"]
+    for fw, sw, dw, warning, critical in itertools.product(
+        args.fatigue_weights, args.stress_weights, args.duration_weights, args.warning_from, args.critical_from
+    ):
+        engines.append(RiskEngine(fw, sw, dw, threshold_levels(warning, critical)))
+        names.append(f"f={fw:g} s={sw:g} d={dw:g} warn>={warning:g} crit>={critical:g}")
+
+    result = run_whatif(HistoryStore(args.history_dir), engines, names, args.station)
+
+    print(f"{result['rows']:,} rows, {len(result['stations'])} stations, {result['sessions']} sessions, "
+          f"{len(engines)} configs in {result['elapsed_seconds']}s\n")
+    print(f"{'config':<48}{'normal':>10}{'warning':>10}{'critical':>10}{'changes':>10}{'escalations':>13}")
+    for row in result['configs']:
+        counts = row['rows_per_level']
+        print(f"{row['name']:<48}{counts['normal']:>10}{counts['warning']:>10}{counts['critical']:>10}"
+              f"{row['total_transitions']:>10}{row['escalations']:>13}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"\nSaved: {args.output}")
@@ -0,0 +1,288 @@
+import threading
+from typing import Dict, List
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+
+METRICS = ('fatigue', 'stress', 'normal', 'risk_score')
+
+
+class _Ring:
+    """
+    Ring of buckets at one width; bucket `key` lives in slot key % len(slots)
+
+    Starts small and doubles (up to `capacity`, the retention) only when two
+    retained buckets would share a slot, so short-lived stations stay cheap.
+    """
+
+    def __init__(self, capacity: int, slots: int = None):
+        self.capacity = capacity
+        self.latest = -1  # Newest bucket key seen
+        self._allocate(min(capacity, slots or config.ROLLUP_INITIAL_SLOTS))
+
+    def _allocate(self, slots: int):
+        self.keys = np.full(slots, -1, dtype=np.int64)  # Bucket held by each slot
+        self.counts = np.zeros(slots, dtype=np.int32)
+        self.sums = np.zeros((slots, len(METRICS)), dtype=np.float64)
+        self.mins = np.full((slots, len(METRICS)), np.inf, dtype=np.float32)
+        self.maxs = np.full((slots, len(METRICS)), -np.inf, dtype=np.float32)
+
+    @staticmethod
+    def slots_for(capacity: int, span: int) -> int:
+        """Smallest doubling of the initial size that holds `span` consecutive keys"""
+        slots = min(capacity, config.ROLLUP_INITIAL_SLOTS)
+        while slots < span and slots < capacity:
+            slots = min(capacity, slots * 2)
+        return slots
+
+    def _retained(self, newest: int) -> np.ndarray:
+        return (self.keys >= 0) & (self.keys > newest - self.capacity)
+
+    def _grow(self, key: int):
+        """Re-slot the retained buckets into a ring large enough to also hold `key`"""
+        newest = max(self.latest, key)
+        keep = self._retained(newest)
+        oldest = min(int(self.keys[keep].min()), key) if keep.any() else key
+
+        old = (self.keys[keep], self.counts[keep], self.sums[keep], self.mins[keep], self.maxs[keep])
+        self._allocate(self.slots_for(self.capacity, newest - oldest + 1))
+        self.store(*old)
+
+    def store(self, keys, counts, sums, mins, maxs):
+        """Place whole buckets (keys must fit the current ring without collisions)"""
+        slots = keys % len(self.keys)
+        self.keys[slots] = keys
+        self.counts[slots] = counts
+        self.sums[slots] = sums
+        self.mins[slots] = mins
+        self.maxs[slots] = maxs
+        if len(keys):
+            self.latest = max(self.latest, int(keys.max()))
+
+    def add(self, key: int, sample: np.ndarray):
+        if key <= self.latest - self.capacity:
+            return  # Older than the retention window
+
+        slot = key % len(self.keys)
+        held = self.keys[slot]
+        if held != key:
+            if held >= 0 and held > max(self.latest, key) - self.capacity:
+                # Slot holds another retained bucket: grow and re-slot
+                self._grow(key)
+                slot = key % len(self.keys)
+            self.keys[slot] = key
+            self.counts[slot] = 0
+            self.sums[slot] = 0
+            self.mins[slot] = np.inf
+            self.maxs[slot] = -np.inf
+
+        self.counts[slot] += 1
+        self.sums[slot] += sample
+        np.minimum(self.mins[slot], sample, out=self.mins[slot])
+        np.maximum(self.maxs[slot], sample, out=self.maxs[slot])
+        self.latest = max(self.latest, key)
+
+    def gather(self, first: int, last: int):
+        """Keys and statistics of the stored buckets within [first, last]"""
+        first = max(first, self.latest - self.capacity + 1)
+        last = min(last, self.latest)
+        if last < first:
+            return None
+
+        keys = np.arange(first, last + 1, dtype=np.int64)
+        slots = keys % len(self.keys)
+        keep = (self.keys[slots] == keys) & (self.counts[slots] > 0)
+        slots = slots[keep]
+        return keys[keep], self.counts[slots], self.sums[slots], self.mins[slots], self.maxs[slots]
+
+
+class MultiResolutionRollup:
+    def __init__(self, resolutions: Dict[int, int] = None):
+        """
+        Incrementally maintained min/mean/max rollups at several bucket widths
+
+        Each station keeps one ring of count/sum/min/max arrays per width,
+        grown on demand up to the retention. A station whose newest sample
+        is older than every retention window is dropped entirely.
+
+        Args:
+            resolutions: {bucket width in seconds: number of buckets retained}
+                         (default from config)
+        """
+        self.resolutions = dict(sorted((resolutions or config.ROLLUP_RESOLUTIONS).items()))
+        self.min_width = next(iter(self.resolutions))
+        self.span = max(width * retention for width, retention in self.resolutions.items())
+        self._rings: Dict[str, Dict[int, _Ring]] = {}
+        self._last_seen: Dict[str, float] = {}  # Newest sample time per station
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _station(self, station_id: str) -> Dict[int, _Ring]:
+        station = self._rings.get(station_id)
+        if station is None:
+            station = {width: _Ring(retention) for width, retention in self.resolutions.items()}
+            self._rings[station_id] = station
+        return station
+
+    def add(self, station_id: str, timestamp: float, values: Dict[str, float]):
+        """
+        Fold one sample into every resolution
+
+        Samples are expected in time order per station; a new bucket
+        overwrites the slot of the one that fell out of the retention window.
+        """
+        sample = np.array([values[name] for name in METRICS], dtype=np.float64)
+
+        with self._lock:
+            for width, ring in self._station(station_id).items():
+                ring.add(int(timestamp // width), sample)
+            self._last_seen[station_id] = max(timestamp, self._last_seen.get(station_id, timestamp))
+
+            if timestamp - self._last_sweep >= self.min_width:
+                self._evict(timestamp)
+
+    def _evict(self, now: float):
+        """Drop stations with nothing left inside any retention window"""
+        self._last_sweep = now
+        expired = [sid for sid, seen in self._last_seen.items() if seen < now - self.span]
+        for station_id in expired:
+            del self._rings[station_id]
+            del self._last_seen[station_id]
+
+    def __len__(self) -> int:
+        """Stations with rollup state"""
+        return len(self._rings)
+
+    def load(self, station_id: str, records: np.ndarray):
+        """
+        Rebuild a station's rollups from stored history records
+
+        Args:
+            station_id: Station to rebuild
+            records: Structured array sorted by timestamp (see history_store)
+        """
+        if not len(records):
+            return
+
+        timestamps = records['timestamp']
+        columns = np.stack([records[name].astype(np.float64) for name in METRICS], axis=1)
+
+        with self._lock:
+            station = {}
+            for width, retention in self.resolutions.items():
+                keys = (timestamps // width).astype(np.int64)
+                unique_keys, starts = np.unique(keys, return_index=True)
+                counts = np.diff(np.append(starts, len(keys)))
+                retained = unique_keys > unique_keys[-1] - retention
+                unique_keys, starts, counts = unique_keys[retained], starts[retained], counts[retained]
+
+                span = int(unique_keys[-1] - unique_keys[0]) + 1
+                ring = _Ring(retention, _Ring.slots_for(retention, span))
+                ring.store(
+                    unique_keys,
+                    counts,
+                    np.add.reduceat(columns, starts, axis=0),
+                    np.minimum.reduceat(columns, starts, axis=0),
+                    np.maximum.reduceat(columns, starts, axis=0)
+                )
+                station[width] = ring
+            self._rings[station_id] = station
+            self._last_seen[station_id] = float(timestamps[-1])
+
+    def _pick_resolution(self, bucket_seconds: int) -> int:
+        """
+        Coarsest stored width that evenly divides the requested width
+
+        Raises:
+            ValueError: If bucket_seconds is not a multiple of the finest width
+        """
+        if bucket_seconds <= 0 or bucket_seconds % self.min_width:
+            raise ValueError(f"bucket_seconds must be a positive multiple of {self.min_width}")
+        return [w for w in self.resolutions if bucket_seconds % w == 0][-1]
+
+    def query(
+        self,
+        station_id: str,
+        start: float,
+        end: float,
+        bucket_seconds: int
+    ) -> List[Dict]:
+        """
+        Get min/mean/max per bucket within [start, end]
+
+        The range is widened to whole buckets of bucket_seconds (aligned to
+        multiples of it), so no bucket is reported with only part of its
+        interval. The cost is proportional to the number of stored buckets
+        covering the range, independent of how many raw samples they summarize.
+
+        Returns:
+            List of {'start', 'count', <metric>: {'min', 'mean', 'max'}}
+            for every non-empty bucket, in time order
+
+        Raises:
+            ValueError: If bucket_seconds is not a multiple of the finest width
+        """
+        width = self._pick_resolution(bucket_seconds)
+        first = int(start // bucket_seconds) * bucket_seconds // width
+        last = (int(end // bucket_seconds) + 1) * bucket_seconds // width - 1
+
+        with self._lock:
+            ring = self._rings.get(station_id, {}).get(width)
+            gathered = ring.gather(first, last) if ring is not None else None
+        if gathered is None or not len(gathered[0]):
+            return []
+
+        # Merge stored buckets into the requested width
+        keys, counts, sums, mins, maxs = gathered
+        out_keys, starts = np.unique((keys * width) // bucket_seconds, return_index=True)
+        counts = np.add.reduceat(counts, starts)
+        sums = np.add.reduceat(sums, starts, axis=0)
+        mins = np.minimum.reduceat(mins, starts, axis=0)
+        maxs = np.maximum.reduceat(maxs, starts, axis=0)
+
+        result = []
+        for j, out_key in enumerate(out_keys.tolist()):
+            count = int(counts[j])
+            entry = {'start': out_key * bucket_seconds, 'count': count}
+            for i, name in enumerate(METRICS):
+                entry[name] = {
+                    'min': float(mins[j, i]),
+                    'mean': float(sums[j, i]) / count,
+                    'max': float(maxs[j, i])
+                }
+            result.append(entry)
+        return result
+
+
+if __name__ == "__main__":
+    # Self-check against a brute-force aggregation, with ranges that do not
+    # start or end on bucket boundaries
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.uniform(0.5, 3.0, 20000))
+    samples = rng.random((len(timestamps), len(METRICS)))
+    rollup = MultiResolutionRollup({10: 10000, 60: 2000, 600: 200})
+    for timestamp, sample in zip(timestamps, samples):
+        rollup.add("check", timestamp, dict(zip(METRICS, sample)))
+
+    for bucket_seconds, start, end in [(3600, 1000, 20000), (600, 1234, 9876), (30, 95, 2017), (120, 0, 40001)]:
+        buckets = rollup.query("check", start, end, bucket_seconds)
+        first, last = start // bucket_seconds, end // bucket_seconds
+        keys = timestamps // bucket_seconds
+        expected = [k for k in range(int(first), int(last) + 1) if np.any(keys == k)]
+        assert [b['start'] // bucket_seconds for b in buckets] == expected, bucket_seconds
+
+        for bucket in buckets:
+            rows = samples[keys == bucket['start'] // bucket_seconds]
+            assert bucket['count'] == len(rows)
+            for i, name in enumerate(METRICS):
+                assert abs(bucket[name]['mean'] - rows[:, i].mean()) < 1e-9
+                assert abs(bucket[name]['min'] - rows[:, i].min()) < 1e-6
+                assert abs(bucket[name]['max'] - rows[:, i].max()) < 1e-6
+        print(f"   {bucket_seconds:>5}s buckets over [{start}, {end}]: {len(buckets)} buckets match")
+
+    print("✅ Rollup self-check passed")
@@ -0,0 +1,63 @@
+from typing import Any, Dict, Iterable, Optional
+import msgpack
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered by orjson, bypassing jsonable_encoder"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class MsgPackResponse(Response):
+    """Compact binary response for clients sending Accept: application/x-msgpack"""
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def negotiated_response(content: Any, accept: Optional[str] = None, **kwargs) -> Response:
+    """
+    Serialize content as msgpack or JSON depending on the Accept header
+
+    Handlers returning this skip FastAPI's jsonable_encoder pass, so content
+    must already consist of plain dicts, lists, strings and numbers.
+    """
+    if accept and MSGPACK_MEDIA_TYPE in accept:
+        return MsgPackResponse(content, **kwargs)
+    return FastJSONResponse(content, **kwargs)
+
+
+def select_fields(
+    payload: Dict,
+    fields: Optional[str],
+    optional: Iterable[str]
+) -> Dict:
+    """
+    Drop optional top-level blocks the client did not ask for
+
+    Args:
+        payload: Full response
+        fields: Comma-separated block names to keep (None = keep all)
+        optional: Block names that may be dropped
+    """
+    if fields is None:
+        return payload
+
+    optional = set(optional)
+    wanted = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = wanted - optional
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(sorted(optional))})"
+        )
+
+    return {key: value for key, value in payload.items() if key not in optional or key in wanted}
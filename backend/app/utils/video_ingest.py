@@ -0,0 +1,259 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import cv2
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import config
+from app.utils.history_store import validate_station_id
+
+
+def is_live_source(source: str) -> bool:
+    """Network streams (rtsp://, http://, ...) as opposed to local video files"""
+    return "://" in source
+
+
+def check_runtime_source(source: str, allowed: List[str] = None):
+    """
+    Allow a source added through the API only if it matches an allowed prefix
+
+    URLs are compared as given, file paths after resolving them, so `..`
+    cannot leave an allowed directory.
+
+    Raises:
+        PermissionError: If runtime sources are disabled or none matches
+    """
+    allowed = config.INGEST_RUNTIME_ALLOWED if allowed is None else allowed
+    if not allowed:
+        raise PermissionError("Adding streams at runtime is disabled (set INGEST_RUNTIME_ALLOWED)")
+
+    for prefix in allowed:
+        if is_live_source(prefix):
+            if source.lower().startswith(prefix.lower()):
+                return
+        elif not is_live_source(source):
+            root = Path(prefix).resolve()
+            path = Path(source).resolve()
+            if path == root or root in path.parents:
+                return
+    raise PermissionError(f"Video source is not in INGEST_RUNTIME_ALLOWED: {source}")
+
+
+class VideoSource:
+    def __init__(
+        self,
+        station_id: str,
+        source: str,
+        process_fn: Callable[[str, np.ndarray], Dict],
+        fps: Optional[float] = None
+    ):
+        """
+        Pull frames from one camera or video file on a dedicated thread
+
+        Every frame is grabbed so a live stream never falls behind, but only
+        frames due at the target rate are decoded and analyzed. Without a
+        fixed fps the interval follows the recommended_interval_ms of each
+        analysis, like the browser client. Live streams are reopened after a
+        failure; files stop at their end and are played back in real time,
+        so session duration, trend and history timestamps (all stamped with
+        the wall clock) match the recording.
+
+        Args:
+            station_id: Session the frames are analyzed under
+            source: RTSP/HTTP URL or path of a video file
+            process_fn: Analysis pipeline, called as process_fn(station_id, frame)
+            fps: Frames analyzed per second (None = adaptive)
+        """
+        self.station_id = station_id
+        self.source = source
+        self.process_fn = process_fn
+        self.fps = fps
+        self.live = is_live_source(source)
+
+        self.state = "starting"
+        self.frames_read = 0
+        self.frames_analyzed = 0
+        self.frames_no_face = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+        self.last_analyzed_at: Optional[float] = None
+
+        self._interval = 1.0 / fps if fps else config.CAPTURE_INTERVAL_MS / 1000
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"ingest-{station_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            capture = cv2.VideoCapture(self.source)
+            if not capture.isOpened():
+                self._fail(f"Cannot open video source {self.source}")
+            else:
+                self.state = "running"
+                try:
+                    self._read(capture)
+                finally:
+                    capture.release()
+
+            if not self.live or self._stop.is_set():
+                break
+
+            # Live stream dropped: reopen after a pause
+            self.reconnects += 1
+            self.state = "reconnecting"
+            self._stop.wait(config.INGEST_RECONNECT_DELAY)
+
+        if self._stop.is_set():
+            self.state = "stopped"
+        elif self.state != "failed":
+            self.state = "finished"
+
+    def _read(self, capture: cv2.VideoCapture):
+        file_fps = capture.get(cv2.CAP_PROP_FPS) or config.INGEST_DEFAULT_FILE_FPS
+        started = time.monotonic()
+        frame_index = 0
+        next_due = 0.0
+
+        while not self._stop.is_set():
+            if not capture.grab():
+                if self.live:
+                    self._fail("Stream read failed")
+                return
+            self.frames_read += 1
+            frame_index += 1
+
+            if not self.live:
+                # Wait until the frame is due at the file's own frame rate
+                delay = started + frame_index / file_fps - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+
+            now = time.monotonic()
+            if now < next_due:
+                continue
+
+            ok, frame = capture.retrieve()
+            if not ok or frame is None:
+                continue
+
+            self._analyze(frame)
+            next_due = now + self._interval
+
+    def _analyze(self, frame: np.ndarray):
+        try:
+            result = self.process_fn(self.station_id, frame)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return
+
+        self.frames_analyzed += 1
+        self.last_analyzed_at = time.time()
+        if result.get('status') == "no_face":
+            self.frames_no_face += 1
+
+        if not self.fps and result.get('recommended_interval_ms'):
+            self._interval = result['recommended_interval_ms'] / 1000
+
+    def _fail(self, message: str):
+        self.errors += 1
+        self.last_error = message
+        self.state = "failed"
+
+    def status(self) -> Dict:
+        return {
+            'station_id': self.station_id,
+            'source': self.source,
+            'live': self.live,
+            'state': self.state,
+            'target_fps': self.fps,
+            'interval_ms': int(self._interval * 1000),
+            'frames_read': self.frames_read,
+            'frames_analyzed': self.frames_analyzed,
+            'frames_no_face': self.frames_no_face,
+            'errors': self.errors,
+            'reconnects': self.reconnects,
+            'last_error': self.last_error,
+            'last_analyzed_at': self.last_analyzed_at
+        }
+
+
+class IngestManager:
+    def __init__(self, process_fn: Callable[[str, np.ndarray], Dict]):
+        """
+        Server-side camera ingest, one VideoSource per station
+
+        Args:
+            process_fn: Analysis pipeline shared by every source
+        """
+        self.process_fn = process_fn
+        self._sources: Dict[str, VideoSource] = {}
+        self._lock = threading.Lock()
+
+    def add(self, station_id: str, source: str, fps: Optional[float] = None) -> Dict:
+        """
+        Start ingesting a source for a station
+
+        Raises:
+            ValueError: If the station id is invalid or the station already
+                        has a running source
+        """
+        validate_station_id(station_id)
+        if not source:
+            raise ValueError("Video source must not be empty")
+
+        with self._lock:
+            current = self._sources.get(station_id)
+            if current is not None and current.running:
+                raise ValueError(f"Station {station_id} already has a running source")
+
+            worker = VideoSource(station_id, source, self.process_fn, fps)
+            self._sources[station_id] = worker
+            worker.start()
+        return worker.status()
+
+    def remove(self, station_id: str) -> Optional[Dict]:
+        """Stop and forget the source of a station (None if there is none)"""
+        with self._lock:
+            worker = self._sources.pop(station_id, None)
+        if worker is None:
+            return None
+        worker.stop()
+        return worker.status()
+
+    def start_configured(self, sources: str = None):
+        """Start the sources listed as "station=source;station=source" (default from config)"""
+        sources = config.INGEST_SOURCES if sources is None else sources
+        for entry in filter(None, (part.strip() for part in sources.split(";"))):
+            station_id, _, source = entry.partition("=")
+            try:
+                self.add(station_id.strip(), source.strip())
+            except ValueError as e:
+                print(f"⚠️ Skipping ingest source {entry!r}: {e}")
+
+    def stop_all(self):
+        with self._lock:
+            workers, self._sources = list(self._sources.values()), {}
+        for worker in workers:
+            worker.stop()
+
+    def status(self) -> List[Dict]:
+        with self._lock:
+            workers = list(self._sources.values())
+        return [worker.status() for worker in workers]
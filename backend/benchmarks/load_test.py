@@ -0,0 +1,144 @@
+"""
+Load generator for /api/analyze-frame
+
+Simulates N stations, each uploading synthetic JPEG frames back to back (or
+at a fixed interval) for a given duration, and reports latency percentiles
+and throughput. Start the server first, e.g. with the fake detector:
+
+    DETECTOR_BACKEND=fake FAKE_INFERENCE_MS=5 uvicorn app.main:app --port 8000
+    python -m benchmarks.load_test --stations 20 --duration 30
+"""
+import argparse
+import itertools
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+# Add backend folder to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.report import find_regressions, summarize_latencies, write_report
+from benchmarks.synthetic_frames import generate_jpeg_frames
+
+
+def encode_multipart(field: str, filename: str, data: bytes, content_type: str = "image/jpeg"):
+    """Build a multipart/form-data body with a single file field"""
+    boundary = uuid.uuid4().hex
+    body = b"".join([
+        f"--{boundary}\r\n".encode(),
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode(),
+        f"Content-Type: {content_type}\r\n\r\n".encode(),
+        data,
+        f"\r\n--{boundary}--\r\n".encode()
+    ])
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class Station(threading.Thread):
+    def __init__(self, url: str, station_id: str, frames: List[bytes], deadline: float, interval: float):
+        """One simulated station uploading frames until the deadline"""
+        super().__init__(daemon=True)
+        self.url = f"{url}/api/analyze-frame?station_id={station_id}"
+        self.bodies = [encode_multipart("file", "frame.jpg", frame) for frame in frames]
+        self.deadline = deadline
+        self.interval = interval
+        self.latencies: List[float] = []
+        self.statuses = Counter()
+
+    def run(self):
+        for body, content_type in itertools.cycle(self.bodies):
+            if time.time() >= self.deadline:
+                break
+            started = time.perf_counter()
+
+            request = urllib.request.Request(
+                self.url, data=body, method="POST", headers={"Content-Type": content_type}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    self.statuses[response.status] += 1
+            except urllib.error.HTTPError as e:
+                self.statuses[e.code] += 1
+            except OSError:
+                self.statuses['connection_error'] += 1
+                time.sleep(0.1)
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.latencies.append(elapsed)
+            if self.interval > elapsed:
+                time.sleep(self.interval - elapsed)
+
+
+def run_load(url: str, stations: int, duration: float, interval: float, resolution) -> Dict:
+    """Drive the API with concurrent stations and summarize the results"""
+    frames = generate_jpeg_frames([resolution])[resolution]
+    deadline = time.time() + duration
+
+    workers = [
+        Station(url, f"bench-{i:04d}", frames, deadline, interval)
+        for i in range(stations)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [value for worker in workers for value in worker.latencies]
+    statuses = sum((worker.statuses for worker in workers), Counter())
+
+    summary = summarize_latencies(latencies)
+    summary.update({
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'statuses': {str(code): count for code, count in statuses.items()}
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/analyze-frame")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--stations", type=int, nargs="+", default=[1, 10, 50], help="Concurrent stations per run")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per run")
+    parser.add_argument("--interval", type=float, default=0.0, help="Seconds between frames per station (0 = closed loop)")
+    parser.add_argument("--resolution", default="640x480", help="Frame size WxH")
+    parser.add_argument("--output", type=Path, help="Report path (default results/load.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 slowdown")
+    args = parser.parse_args()
+
+    resolution = tuple(int(v) for v in args.resolution.lower().split("x"))
+
+    results = {}
+    for count in args.stations:
+        print(f"🚀 {count} stations for {args.duration:.0f}s...")
+        stats = run_load(args.url, count, args.duration, args.interval, resolution)
+        results[f"stations={count}"] = stats
+        print(
+            f"   p50 {stats.get('p50_ms', 0):8.2f} ms   p95 {stats.get('p95_ms', 0):8.2f} ms   "
+            f"p99 {stats.get('p99_ms', 0):8.2f} ms   {stats['throughput_rps']:8.1f} req/s   {stats['statuses']}"
+        )
+
+    path = write_report("load", results, args.output)
+    print(f"\n✅ Report saved to: {path}")
+
+    if args.baseline:
+        regressions = find_regressions(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
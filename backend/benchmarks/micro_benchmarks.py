@@ -0,0 +1,147 @@
+"""
+Microbenchmarks of the frame processing building blocks
+
+Usage (from the backend folder):
+    python -m benchmarks.micro_benchmarks [--repeat 200] [--baseline results/micro.json]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+# Add backend folder to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.fake_detector import FakeEmotionDetector
+from app.models.risk_engine import RiskEngine
+from app.utils.temporal_smoothing import TemporalSmoother
+from benchmarks.report import find_regressions, summarize_latencies, write_report
+from benchmarks.synthetic_frames import DEFAULT_RESOLUTIONS, generate_face_frame
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 5) -> Dict:
+    """Time repeated calls of fn"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize_latencies(samples)
+
+
+def random_prediction(rng: random.Random) -> Dict:
+    values = [rng.random() for _ in range(3)]
+    total = sum(values)
+    probabilities = dict(zip(["Fatigue", "Stress", "Normal"], (v / total for v in values)))
+    emotion = max(probabilities, key=probabilities.get)
+    return {'emotion': emotion, 'confidence': probabilities[emotion], 'probabilities': probabilities}
+
+
+def bench_preprocess_face(results: Dict, repeat: int):
+    # Preprocessing is shared by all backends, so the fake one needs no model
+    detector = FakeEmotionDetector(inference_ms=0)
+
+    for w, h in DEFAULT_RESOLUTIONS:
+        frame = generate_face_frame(w, h)
+        face = frame[h // 4: 3 * h // 4, w // 4: 3 * w // 4]
+        results[f"preprocess_face[{w}x{h}]"] = measure(lambda: detector.preprocess_face(face), repeat)
+
+
+def bench_fake_pipeline(results: Dict, repeat: int):
+    """predict_emotion without model cost: crop, preprocess and result formatting"""
+    detector = FakeEmotionDetector(inference_ms=0)
+    detector.prediction_cache.max_entries = 0  # The same frame repeats; measure the uncached path
+
+    for w, h in DEFAULT_RESOLUTIONS:
+        frame = generate_face_frame(w, h)
+        results[f"predict_emotion[fake,{w}x{h}]"] = measure(lambda: detector.predict_emotion(frame), repeat)
+
+
+def bench_temporal_smoother(results: Dict, repeat: int):
+    rng = random.Random(0)
+    predictions = [random_prediction(rng)['probabilities'] for _ in range(1000)]
+    smoother = TemporalSmoother()
+    index = iter(range(10 ** 9))
+
+    def step():
+        smoother.add_prediction(predictions[next(index) % len(predictions)])
+        smoother.get_smoothed_probabilities()
+        smoother.get_trend()
+
+    results["temporal_smoother_step"] = measure(step, repeat)
+
+
+def bench_batch_statistics(results: Dict, repeat: int):
+    rng = random.Random(0)
+    engine = RiskEngine()
+
+    for size in (100, 1000, 10000):
+        predictions = [random_prediction(rng) for _ in range(size)]
+        results[f"calculate_batch_statistics[{size}]"] = measure(
+            lambda: engine.calculate_batch_statistics(predictions),
+            max(5, repeat // (size // 100))
+        )
+
+
+def bench_model_inference(results: Dict, repeat: int):
+    """Inference cost of the architecture (untrained weights are as fast as trained ones)"""
+    try:
+        from ml_training.model_architecture import create_emotion_model
+    except ImportError as e:
+        print(f"⚠️  Skipping model inference: {e}")
+        return
+
+    model = create_emotion_model()
+    face = np.random.default_rng(0).random((1, 48, 48, 1)).astype(np.float32)
+
+    results["model_predict[batch=1]"] = measure(lambda: model.predict(face, verbose=0), repeat)
+    results["model_call[batch=1]"] = measure(lambda: model(face, training=False), repeat)
+
+
+BENCHMARKS = {
+    'preprocess_face': bench_preprocess_face,
+    'fake_pipeline': bench_fake_pipeline,
+    'temporal_smoother': bench_temporal_smoother,
+    'batch_statistics': bench_batch_statistics,
+    'model_inference': bench_model_inference
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run microbenchmarks")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--output", type=Path, help="Report path (default results/micro.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 slowdown")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        print(f"⏱️  {name}...")
+        BENCHMARKS[name](results, args.repeat)
+
+    for case, stats in results.items():
+        print(f"   {case:40s} p50 {stats['p50_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms")
+
+    path = write_report("micro", results, args.output)
+    print(f"\n✅ Report saved to: {path}")
+
+    if args.baseline:
+        regressions = find_regressions(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import json
+import platform
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def summarize_latencies(samples: Sequence[float]) -> Dict:
+    """p50/p95/p99/mean/max of latency samples (seconds in, milliseconds out)"""
+    if not len(samples):
+        return {'count': 0}
+
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(len(values)),
+        'mean_ms': round(float(values.mean()), 3),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(values.max()), 3)
+    }
+
+
+def write_report(name: str, results: Dict, path: Path = None) -> Path:
+    """Write benchmark results as JSON together with host information"""
+    path = Path(path) if path else RESULTS_DIR / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        'benchmark': name,
+        'created': datetime.now().isoformat(),
+        'host': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'system': platform.system()
+        },
+        'results': results
+    }
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def find_regressions(
+    results: Dict,
+    baseline_path: Path,
+    max_regression: float,
+    metric: str = 'p95_ms'
+) -> List[str]:
+    """
+    Compare a latency metric against a previous report
+
+    Args:
+        results: Current results {case: {metric: value}}
+        baseline_path: Report written by an earlier run
+        max_regression: Allowed relative slowdown (0.2 = 20%)
+        metric: Latency field to compare
+
+    Returns:
+        Human readable description of every regressed case
+    """
+    baseline = json.loads(Path(baseline_path).read_text())['results']
+    regressions = []
+
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not isinstance(current, dict) or not isinstance(previous, dict):
+            continue
+        if metric not in current or not previous.get(metric):
+            continue
+
+        change = current[metric] / previous[metric] - 1
+        if change > max_regression:
+            regressions.append(
+                f"{case}: {metric} {previous[metric]:.3f} -> {current[metric]:.3f} ms (+{change * 100:.0f}%)"
+            )
+
+    return regressions
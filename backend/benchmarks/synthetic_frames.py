@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Resolutions sent by typical station cameras (width, height)
+DEFAULT_RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+
+
+def generate_face_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    Draw a synthetic BGR frame with a face-like figure
+
+    The figure (skin-toned oval, eyes, brows, mouth) is randomly jittered
+    per seed so consecutive frames are not byte-identical.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Noisy background
+    frame = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+
+    cx = int(width * (0.5 + rng.uniform(-0.05, 0.05)))
+    cy = int(height * (0.5 + rng.uniform(-0.05, 0.05)))
+    face_w = int(min(width, height) * rng.uniform(0.22, 0.3))
+    face_h = int(face_w * 1.3)
+
+    # Head
+    skin = tuple(int(v) for v in rng.integers([90, 130, 170], [130, 170, 220]))
+    cv2.ellipse(frame, (cx, cy), (face_w, face_h), 0, 0, 360, skin, -1)
+
+    # Eyes and brows
+    eye_dy = int(face_h * 0.25)
+    eye_dx = int(face_w * 0.4)
+    eye_r = max(2, face_w // 10)
+    brow_tilt = int(rng.uniform(-1, 1) * eye_r)
+    for side in (-1, 1):
+        ex = cx + side * eye_dx
+        ey = cy - eye_dy
+        cv2.circle(frame, (ex, ey), eye_r, (255, 255, 255), -1)
+        cv2.circle(frame, (ex, ey), max(1, eye_r // 2), (30, 30, 30), -1)
+        cv2.line(
+            frame,
+            (ex - eye_r, ey - 2 * eye_r + side * brow_tilt),
+            (ex + eye_r, ey - 2 * eye_r - side * brow_tilt),
+            (40, 40, 60),
+            max(1, eye_r // 2)
+        )
+
+    # Mouth (smile or frown)
+    mouth_w = int(face_w * 0.45)
+    mouth_h = max(2, int(face_h * rng.uniform(0.05, 0.15)))
+    start, end = (0, 180) if rng.random() < 0.5 else (180, 360)
+    cv2.ellipse(frame, (cx, cy + int(face_h * 0.45)), (mouth_w, mouth_h), 0, start, end, (60, 40, 150), max(1, eye_r // 2))
+
+    return frame
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 80) -> bytes:
+    """Encode a frame the way browsers upload it"""
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+def generate_jpeg_frames(
+    resolutions: List[Tuple[int, int]] = None,
+    frames_per_resolution: int = 8
+) -> Dict[Tuple[int, int], List[bytes]]:
+    """Pre-encode a pool of JPEG frames per resolution"""
+    resolutions = resolutions or DEFAULT_RESOLUTIONS
+    return {
+        (w, h): [encode_jpeg(generate_face_frame(w, h, seed)) for seed in range(frames_per_resolution)]
+        for w, h in resolutions
+    }
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    out_dir = Path(__file__).parent / "results" / "frames"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for (w, h), frames in generate_jpeg_frames(frames_per_resolution=2).items():
+        for i, data in enumerate(frames):
+            path = out_dir / f"face_{w}x{h}_{i}.jpg"
+            path.write_bytes(data)
+            print(f"   {path.name}: {len(data) / 1024:.1f} KB")
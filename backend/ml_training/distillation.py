@@ -0,0 +1,140 @@
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+
+
+class Distiller(tf.keras.Model):
+    """
+    Train a student model on labels and on the teacher's softened outputs
+
+    Both models end in softmax, so logits are recovered as log-probabilities
+    before applying the temperature. Only the student is trained.
+    """
+
+    def __init__(self, student, teacher):
+        super().__init__()
+        self.student = student
+        self.teacher = teacher
+        self.teacher.trainable = False
+
+    def compile(self, optimizer, metrics, alpha=0.5, temperature=4.0):
+        """
+        Args:
+            alpha: Weight of the label loss (1 - alpha goes to the teacher)
+            temperature: Softening applied to both output distributions
+        """
+        super().compile(optimizer=optimizer, metrics=metrics)
+        self.student_loss_fn = tf.keras.losses.SparseCategoricalCrossentropy()
+        self.distillation_loss_fn = tf.keras.losses.KLDivergence()
+        self.alpha = alpha
+        self.temperature = temperature
+
+    def _soften(self, probabilities):
+        logits = tf.math.log(tf.clip_by_value(probabilities, 1e-7, 1.0))
+        return tf.nn.softmax(logits / self.temperature, axis=-1)
+
+    def train_step(self, data):
+        x, y = data
+        teacher_predictions = self.teacher(x, training=False)
+
+        with tf.GradientTape() as tape:
+            student_predictions = self.student(x, training=True)
+            student_loss = self.student_loss_fn(y, student_predictions)
+            distillation_loss = self.distillation_loss_fn(
+                self._soften(teacher_predictions),
+                self._soften(student_predictions)
+            ) * self.temperature ** 2
+            loss = self.alpha * student_loss + (1 - self.alpha) * distillation_loss
+
+        gradients = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(gradients, self.student.trainable_variables))
+
+        self.compiled_metrics.update_state(y, student_predictions)
+        results = {m.name: m.result() for m in self.metrics}
+        results.update({'loss': loss, 'student_loss': student_loss, 'distillation_loss': distillation_loss})
+        return results
+
+    def test_step(self, data):
+        x, y = data
+        student_predictions = self.student(x, training=False)
+        student_loss = self.student_loss_fn(y, student_predictions)
+
+        self.compiled_metrics.update_state(y, student_predictions)
+        results = {m.name: m.result() for m in self.metrics}
+        results['loss'] = student_loss
+        return results
+
+    def call(self, inputs, training=False):
+        return self.student(inputs, training=training)
+
+
+def prunable_kernels(model):
+    """Weight tensors subject to magnitude pruning (output layer excluded)"""
+    kernels = []
+    for layer in model.layers[:-1]:
+        if isinstance(layer, layers.SeparableConv2D):
+            kernels.append(layer.pointwise_kernel)
+        elif isinstance(layer, (layers.Conv2D, layers.Dense)) and not isinstance(layer, layers.DepthwiseConv2D):
+            kernels.append(layer.kernel)
+    return kernels
+
+
+def model_sparsity(model):
+    """Fraction of zero weights in the prunable kernels"""
+    kernels = [k.numpy() for k in prunable_kernels(model)]
+    total = sum(k.size for k in kernels)
+    return float(sum(np.count_nonzero(k == 0) for k in kernels) / total) if total else 0.0
+
+
+class MagnitudePruning(tf.keras.callbacks.Callback):
+    """
+    Zero the smallest-magnitude weights of each prunable layer during training
+
+    Sparsity ramps up polynomially from 0 to the target between begin_epoch
+    and end_epoch; masks are re-applied after every batch so pruned weights
+    stay at zero while the rest fine-tune. Put it after EarlyStopping in the
+    callback list: on train end the masks are recomputed at the target
+    sparsity, after any best-weights restore.
+    """
+
+    def __init__(self, target_sparsity, begin_epoch=0, end_epoch=10, model=None):
+        """
+        Args:
+            target_sparsity: Final fraction of zero weights per layer (0-1)
+            begin_epoch: Epoch at which pruning starts
+            end_epoch: Epoch at which the target sparsity is reached
+            model: Model to prune (default: the model being trained)
+        """
+        super().__init__()
+        self.target_sparsity = target_sparsity
+        self.begin_epoch = begin_epoch
+        self.end_epoch = max(end_epoch, begin_epoch + 1)
+        self.pruned_model = model
+        self.masks = []
+
+    def _sparsity_at(self, epoch):
+        if epoch < self.begin_epoch:
+            return 0.0
+        progress = min(1.0, (epoch - self.begin_epoch + 1) / (self.end_epoch - self.begin_epoch))
+        return self.target_sparsity * (1 - (1 - progress) ** 3)
+
+    def _update_masks(self, sparsity):
+        self.masks = []
+        for kernel in prunable_kernels(self.pruned_model or self.model):
+            weights = np.abs(kernel.numpy())
+            threshold = np.quantile(weights, sparsity) if sparsity > 0 else -1.0
+            self.masks.append((kernel, tf.constant(weights > threshold, dtype=kernel.dtype)))
+        self._apply_masks()
+
+    def _apply_masks(self):
+        for kernel, mask in self.masks:
+            kernel.assign(kernel * mask)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._update_masks(self._sparsity_at(epoch))
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._apply_masks()
+
+    def on_train_end(self, logs=None):
+        self._update_masks(self.target_sparsity)
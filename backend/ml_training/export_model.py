@@ -0,0 +1,258 @@
+import argparse
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+
+WEIGHTED_LAYERS = (layers.Conv2D, layers.SeparableConv2D, layers.DepthwiseConv2D, layers.Dense)
+
+
+def inference_model_path(model_path):
+    """emotion_model_final.h5 -> emotion_model_final_inference.h5"""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}_inference{model_path.suffix}")
+
+
+def batch_norm_affine(layer):
+    """BatchNormalization at inference as y = scale * x + shift"""
+    mean = layer.moving_mean.numpy()
+    variance = layer.moving_variance.numpy()
+    gamma = layer.gamma.numpy() if layer.gamma is not None else np.ones_like(mean)
+    beta = layer.beta.numpy() if layer.beta is not None else np.zeros_like(mean)
+    scale = gamma / np.sqrt(variance + layer.epsilon)
+    return scale, beta - mean * scale
+
+
+class _Folded:
+    """A layer of the inference model: config plus (possibly updated) weights"""
+
+    def __init__(self, layer):
+        self.cls = layer.__class__
+        self.config = layer.get_config()
+        self.config.pop('batch_input_shape', None)
+        self.weights = [np.array(w) for w in layer.get_weights()]
+
+    @property
+    def is_linear(self):
+        return issubclass(self.cls, WEIGHTED_LAYERS) and self.config.get('activation') == 'linear'
+
+    def _bias(self, channels):
+        if not self.config.get('use_bias', True):
+            self.config['use_bias'] = True
+            self.weights.append(np.zeros(channels, dtype=np.float32))
+        return self.weights[-1]
+
+    def fold_output(self, scale, shift):
+        """Absorb y = scale * out + shift applied to this layer's output"""
+        bias = self._bias(len(scale))
+        if issubclass(self.cls, layers.DepthwiseConv2D):
+            kernel = self.weights[0]
+            self.weights[0] = kernel * scale.reshape(kernel.shape[2], kernel.shape[3])
+        elif issubclass(self.cls, layers.SeparableConv2D):
+            self.weights[1] = self.weights[1] * scale  # Pointwise kernel
+        else:
+            self.weights[0] = self.weights[0] * scale
+        self.weights[-1] = bias * scale + shift
+
+    def fold_input(self, scale, shift):
+        """Absorb x = scale * in + shift applied to this layer's input (Dense, valid Conv2D)"""
+        kernel = self.weights[0]
+        bias = self._bias(kernel.shape[-1])
+        if issubclass(self.cls, layers.Dense):
+            self.weights[-1] = bias + shift @ kernel
+            self.weights[0] = kernel * scale[:, None]
+        else:
+            self.weights[-1] = bias + np.einsum('hwio,i->o', kernel, shift)
+            self.weights[0] = kernel * scale[None, None, :, None]
+
+    def can_fold_input(self):
+        if issubclass(self.cls, layers.Dense):
+            return True
+        # A shift on zero-padded borders would not be exact
+        return self.cls is layers.Conv2D and self.config.get('padding') == 'valid' and self.config.get('groups', 1) == 1
+
+
+def _affine_layer(scale, shift):
+    """Materialize a pending affine that cannot be folded further"""
+    epsilon = 1e-3
+    layer = layers.BatchNormalization(epsilon=epsilon)
+    layer.build((None, len(scale)))
+    layer.set_weights([
+        scale.astype(np.float32),
+        shift.astype(np.float32),
+        np.zeros_like(scale, dtype=np.float32),
+        np.full_like(scale, 1 - epsilon, dtype=np.float32)
+    ])
+    return _Folded(layer)
+
+
+def fold_batch_norm(model):
+    """
+    Inference-only copy of a Sequential model without BatchNorm and Dropout
+
+    A BatchNorm right after a linear Conv/Dense is folded into that layer's
+    weights. A BatchNorm after a non-linearity (Conv -> ReLU -> BN, as in the
+    baseline) is instead carried forward through MaxPool (when every scale is
+    positive, so the max is preserved), pooling, Flatten and Dropout, and
+    folded into the input side of the next Dense or valid-padded Conv2D.
+    Where neither is exact, an equivalent BatchNorm is kept.
+
+    Returns:
+        (folded model, number of BatchNorm layers removed)
+    """
+    folded = []
+    pending = None  # (scale, shift) not yet absorbed
+    removed = 0
+
+    def flush():
+        nonlocal pending
+        if pending is not None:
+            folded.append(_affine_layer(*pending))
+            pending = None
+
+    for layer in model.layers:
+        if isinstance(layer, layers.Dropout):
+            continue
+
+        if isinstance(layer, layers.BatchNormalization):
+            scale, shift = batch_norm_affine(layer)
+            removed += 1
+            if pending is None and folded and folded[-1].is_linear:
+                folded[-1].fold_output(scale, shift)
+            elif pending is None:
+                pending = (scale, shift)
+            else:
+                pending = (pending[0] * scale, pending[1] * scale + shift)
+            continue
+
+        if pending is not None:
+            scale, shift = pending
+            if isinstance(layer, (layers.MaxPooling2D, layers.GlobalMaxPooling2D)) and np.all(scale > 0):
+                pass
+            elif isinstance(layer, (layers.AveragePooling2D, layers.GlobalAveragePooling2D)):
+                pass
+            elif isinstance(layer, layers.Flatten):
+                # Channels-last flatten: the channel index varies fastest
+                repeats = int(np.prod(layer.input_shape[1:-1]))
+                pending = (np.tile(scale, repeats), np.tile(shift, repeats))
+            elif isinstance(layer, WEIGHTED_LAYERS) and _Folded(layer).can_fold_input():
+                entry = _Folded(layer)
+                entry.fold_input(scale, shift)
+                folded.append(entry)
+                pending = None
+                continue
+            else:
+                # Not exact to carry further: keep one equivalent BatchNorm
+                flush()
+                removed -= 1
+
+        folded.append(_Folded(layer))
+
+    if pending is not None:
+        flush()
+        removed -= 1
+
+    inference_model = tf.keras.Sequential([tf.keras.Input(shape=model.input_shape[1:])])
+    for entry in folded:
+        inference_model.add(entry.cls.from_config(entry.config))
+    for entry, layer in zip(folded, inference_model.layers):
+        layer.set_weights(entry.weights)
+
+    return inference_model, removed
+
+
+def verify_equivalent(model, inference_model, X, atol=1e-4):
+    """Maximum output difference and argmax agreement on X"""
+    expected = model.predict(X, batch_size=256, verbose=0)
+    actual = inference_model.predict(X, batch_size=256, verbose=0)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1)))
+    return max_diff <= atol, max_diff, agreement
+
+
+def export_inference_model(model_path, output_path=None, X_test=None, atol=1e-4):
+    """
+    Fold, verify and save the inference model next to the trained one
+
+    Raises:
+        ValueError: If the folded model is not numerically equivalent on X_test
+    """
+    output_path = Path(output_path or inference_model_path(model_path))
+
+    print(f"\n🔧 Exporting inference model from: {model_path}")
+    model = tf.keras.models.load_model(str(model_path), compile=False)
+    inference_model, removed = fold_batch_norm(model)
+    print(f"   BatchNorm layers folded: {removed}")
+    print(f"   Layers: {len(model.layers)} -> {len(inference_model.layers)}")
+
+    if X_test is not None:
+        ok, max_diff, agreement = verify_equivalent(model, inference_model, X_test, atol)
+        print(f"   Max output difference on test split: {max_diff:.2e} (argmax agreement {agreement*100:.2f}%)")
+        if not ok:
+            raise ValueError(f"Folded model differs by {max_diff:.2e} (> {atol:.0e}); not saved")
+
+    inference_model.save(str(output_path))
+    print(f"✅ Inference model saved to: {output_path}")
+    return inference_model
+
+
+def _randomize_batch_norm(model, rng):
+    """Give every BatchNorm non-trivial statistics, as after training"""
+    for layer in model.layers:
+        if isinstance(layer, layers.BatchNormalization):
+            channels = layer.moving_mean.shape[-1]
+            layer.set_weights([
+                rng.uniform(0.5, 1.5, channels).astype(np.float32),   # gamma
+                rng.normal(0, 0.5, channels).astype(np.float32),      # beta
+                rng.normal(0, 0.5, channels).astype(np.float32),      # moving mean
+                rng.uniform(0.5, 2.0, channels).astype(np.float32)    # moving variance
+            ])
+
+
+def self_check(samples=64, atol=1e-4, seed=0):
+    """
+    Fold randomly initialized baseline and compact models and check equivalence
+
+    Exercises fold_batch_norm against the current architectures without a
+    trained model or dataset.
+
+    Raises:
+        AssertionError: If a folded model differs or still has every BatchNorm
+    """
+    from model_architecture import create_emotion_model, create_compact_model
+
+    rng = np.random.default_rng(seed)
+    X = rng.random((samples, 48, 48, 1)).astype(np.float32)
+
+    for name, model in [('baseline', create_emotion_model()), ('compact', create_compact_model())]:
+        _randomize_batch_norm(model, rng)
+        inference_model, removed = fold_batch_norm(model)
+        ok, max_diff, agreement = verify_equivalent(model, inference_model, X, atol)
+        print(f"   {name}: {removed} BatchNorm folded, max difference {max_diff:.2e}, argmax agreement {agreement*100:.1f}%")
+        assert ok, f"{name}: folded model differs by {max_diff:.2e} (> {atol:.0e})"
+        assert removed > 0, f"{name}: no BatchNorm layer was folded"
+        assert not any(isinstance(l, layers.Dropout) for l in inference_model.layers), f"{name}: Dropout left"
+
+    print("✅ Folding self-check passed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold BatchNorm and strip Dropout for inference")
+    parser.add_argument('model', nargs='?', default='../saved_models/emotion_model_final.h5')
+    parser.add_argument('--output', help="Default: <model>_inference.h5")
+    parser.add_argument('--data', default='processed_data', help="Folder with X_test.npy for verification")
+    parser.add_argument('--atol', type=float, default=1e-4, help="Allowed output difference")
+    parser.add_argument('--self-check', action='store_true', help="Fold random baseline/compact models and verify, then exit")
+    args = parser.parse_args()
+
+    if args.self_check:
+        self_check(atol=args.atol)
+        raise SystemExit(0)
+
+    X_test = None
+    if (Path(args.data) / 'X_test.npy').exists():
+        X_test = np.load(Path(args.data) / 'X_test.npy')
+    else:
+        print("⚠️ No test split found, saving without verification")
+
+    export_inference_model(args.model, args.output, X_test, args.atol)
@@ -55,6 +55,57 @@ def create_emotion_model():
     
     return model
 
+def create_compact_model(width=16, learning_rate=0.001):
+    """
+    Compact CNN for CPU deployments
+    Depthwise-separable convs and global average pooling instead of the
+    stacked dense layers; about 3% of the baseline parameters
+    Input: 48x48x1 grayscale images
+    Output: 3 classes (Fatigue, Stress, Normal)
+    
+    Args:
+        width: Filters of the first block (doubled in each following block)
+        learning_rate: Adam learning rate
+    """
+    
+    model = models.Sequential([
+        # Block 1 (a separable conv gains nothing on a single input channel)
+        layers.Conv2D(width, (3, 3), padding='same', use_bias=False, input_shape=(48, 48, 1)),
+        layers.BatchNormalization(),
+        layers.ReLU(),
+        layers.MaxPooling2D((2, 2)),
+        
+        # Block 2
+        layers.SeparableConv2D(width * 2, (3, 3), padding='same', use_bias=False),
+        layers.BatchNormalization(),
+        layers.ReLU(),
+        layers.MaxPooling2D((2, 2)),
+        
+        # Block 3
+        layers.SeparableConv2D(width * 4, (3, 3), padding='same', use_bias=False),
+        layers.BatchNormalization(),
+        layers.ReLU(),
+        layers.MaxPooling2D((2, 2)),
+        
+        # Block 4
+        layers.SeparableConv2D(width * 8, (3, 3), padding='same', use_bias=False),
+        layers.BatchNormalization(),
+        layers.ReLU(),
+        
+        # Classifier
+        layers.GlobalAveragePooling2D(),
+        layers.Dropout(0.3),
+        layers.Dense(3, activation='softmax')  # 3 classes
+    ])
+    
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    
+    return model
+
 def get_model_summary():
     """Print model architecture"""
     model = create_emotion_model()
@@ -65,4 +116,5 @@ if __name__ == "__main__":
     print("🧠 Creating model architecture...")
     model = get_model_summary()
     print("\n✅ Model created successfully!")
-    print(f"   Total parameters: {model.count_params():,}")
\ No newline at end of file
+    print(f"   Total parameters: {model.count_params():,}")
+    print(f"   Compact variant parameters: {create_compact_model().count_params():,}")
\ No newline at end of file
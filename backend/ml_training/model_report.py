@@ -0,0 +1,123 @@
+import argparse
+import json
+import time
+from pathlib import Path
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+
+
+def count_flops(model):
+    """
+    Floating point operations of one forward pass (2 per multiply-add)
+    Counts convolution and dense layers, which dominate the cost
+    """
+    macs = 0
+    for layer in model.layers:
+        if isinstance(layer, (layers.Conv2D, layers.SeparableConv2D, layers.DepthwiseConv2D)):
+            _, out_h, out_w, out_c = layer.output_shape
+            in_c = layer.input_shape[-1]
+            kernel_area = layer.kernel_size[0] * layer.kernel_size[1]
+
+            if isinstance(layer, layers.SeparableConv2D):
+                depthwise = out_h * out_w * in_c * layer.depth_multiplier * kernel_area
+                macs += depthwise + out_h * out_w * in_c * layer.depth_multiplier * out_c
+            elif isinstance(layer, layers.DepthwiseConv2D):
+                macs += out_h * out_w * in_c * layer.depth_multiplier * kernel_area
+            else:
+                macs += out_h * out_w * out_c * in_c * kernel_area
+        elif isinstance(layer, layers.Dense):
+            macs += layer.input_shape[-1] * layer.units
+    return 2 * macs
+
+
+def count_nonzero_params(model):
+    return int(sum(np.count_nonzero(w) for w in model.get_weights()))
+
+
+def measure_cpu_latency(model, runs=200, warmup=20):
+    """Single-frame latency on CPU in milliseconds (p50, p95)"""
+    x = tf.constant(np.random.rand(1, 48, 48, 1).astype(np.float32))
+    timings = []
+
+    with tf.device('/CPU:0'):
+        for _ in range(warmup):
+            model(x, training=False)
+        for _ in range(runs):
+            start = time.perf_counter()
+            model(x, training=False)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 95))
+
+
+def evaluate_accuracy(model, X_test, y_test):
+    predictions = model.predict(X_test, batch_size=256, verbose=0)
+    return float(np.mean(np.argmax(predictions, axis=1) == y_test))
+
+
+def describe_model(name, model, X_test=None, y_test=None, runs=200):
+    """Size, cost, latency and (if test data is given) accuracy of a model"""
+    p50, p95 = measure_cpu_latency(model, runs)
+    return {
+        'name': name,
+        'params': int(model.count_params()),
+        'nonzero_params': count_nonzero_params(model),
+        'flops': count_flops(model),
+        'cpu_latency_p50_ms': round(p50, 3),
+        'cpu_latency_p95_ms': round(p95, 3),
+        'accuracy': round(evaluate_accuracy(model, X_test, y_test), 4) if X_test is not None else None
+    }
+
+
+def compare_models(models, X_test=None, y_test=None, runs=200, output=None):
+    """
+    Report every model relative to the first one (the baseline)
+
+    Args:
+        models: List of (name, keras model) pairs
+        X_test, y_test: Test split for accuracy (optional)
+        runs: Timed forward passes per model
+        output: Path of the JSON report (optional)
+    """
+    rows = [describe_model(name, model, X_test, y_test, runs) for name, model in models]
+
+    baseline = rows[0]
+    for row in rows:
+        row['params_ratio'] = round(row['params'] / baseline['params'], 4)
+        row['flops_ratio'] = round(row['flops'] / baseline['flops'], 4)
+        row['speedup_p50'] = round(baseline['cpu_latency_p50_ms'] / row['cpu_latency_p50_ms'], 2)
+        if row['accuracy'] is not None:
+            row['accuracy_delta'] = round(row['accuracy'] - baseline['accuracy'], 4)
+
+    print("\n📏 Model comparison")
+    print(f"   {'model':<24}{'params':>10}{'nonzero':>10}{'MFLOPs':>9}{'p50 ms':>9}{'p95 ms':>9}{'accuracy':>10}")
+    for row in rows:
+        accuracy = f"{row['accuracy']*100:.2f}%" if row['accuracy'] is not None else "-"
+        print(
+            f"   {row['name']:<24}{row['params']:>10,}{row['nonzero_params']:>10,}"
+            f"{row['flops']/1e6:>9.2f}{row['cpu_latency_p50_ms']:>9.2f}{row['cpu_latency_p95_ms']:>9.2f}{accuracy:>10}"
+        )
+
+    if output:
+        Path(output).write_text(json.dumps(rows, indent=2))
+        print(f"   Report saved: {output}")
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare saved emotion models (first = baseline)")
+    parser.add_argument('models', nargs='+', help="Paths of .h5 models")
+    parser.add_argument('--data', default='processed_data', help="Folder with X_test.npy / y_test.npy")
+    parser.add_argument('--runs', type=int, default=200, help="Timed forward passes per model")
+    parser.add_argument('--output', default='model_report.json')
+    args = parser.parse_args()
+
+    X_test = y_test = None
+    if (Path(args.data) / 'X_test.npy').exists():
+        X_test = np.load(Path(args.data) / 'X_test.npy')
+        y_test = np.load(Path(args.data) / 'y_test.npy')
+
+    loaded = [(Path(path).stem, tf.keras.models.load_model(path, compile=False)) for path in args.models]
+    compare_models(loaded, X_test, y_test, args.runs, args.output)
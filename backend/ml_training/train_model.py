@@ -1,9 +1,17 @@
+import argparse
+from pathlib import Path
 import numpy as np
 import tensorflow as tf
-from model_architecture import create_emotion_model
+from model_architecture import create_emotion_model, create_compact_model
+from distillation import Distiller, MagnitudePruning, model_sparsity
+from model_report import compare_models
+from export_model import export_inference_model
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLROnPlateau
 import matplotlib.pyplot as plt
 
+BASELINE_MODEL_PATH = '../saved_models/emotion_model_final.h5'
+COMPACT_MODEL_PATH = '../saved_models/emotion_model_compact.h5'
+
 def train_model():
     """Train the emotion detection model"""
     
@@ -61,15 +69,27 @@ def train_model():
     print(f"   Test Loss: {test_loss:.4f}")
     
     # Save final model
-    model.save('../saved_models/emotion_model_final.h5')
-    print("\n✅ Model saved to: ../saved_models/emotion_model_final.h5")
+    model.save(BASELINE_MODEL_PATH)
+    print(f"\n✅ Model saved to: {BASELINE_MODEL_PATH}")
+    
+    # Inference-only copy (BatchNorm folded, Dropout stripped) for the backend
+    export_for_inference(BASELINE_MODEL_PATH, X_test)
     
     # Plot training history
     plot_training_history(history)
     
     return model, history
 
-def plot_training_history(history):
+def export_for_inference(model_path, X_test):
+    """Export the inference model, keeping the trained one if folding fails"""
+    try:
+        export_inference_model(model_path, X_test=X_test)
+    except Exception as e:
+        # Never lose a finished training run to the export step
+        print(f"⚠️ Inference export skipped: {e}")
+        print(f"   The backend will load {model_path}")
+
+def plot_training_history(history, filename='training_history.png'):
     """Plot training metrics"""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
     
@@ -92,8 +112,146 @@ def plot_training_history(history):
     ax2.grid(True)
     
     plt.tight_layout()
-    plt.savefig('training_history.png', dpi=150, bbox_inches='tight')
-    print("   Training plot saved: training_history.png")
+    plt.savefig(filename, dpi=150, bbox_inches='tight')
+    print(f"   Training plot saved: {filename}")
+
+def train_compact_model(
+    teacher_path=BASELINE_MODEL_PATH,
+    width=16,
+    temperature=4.0,
+    alpha=0.3,
+    prune_sparsity=0.0,
+    epochs=50,
+    output=COMPACT_MODEL_PATH
+):
+    """
+    Train the compact variant, distilled from the baseline model if it exists
+    
+    Args:
+        teacher_path: Trained baseline model (None = no distillation)
+        width: Filters of the first compact block
+        temperature: Distillation softening temperature
+        alpha: Weight of the label loss versus the teacher loss
+        prune_sparsity: Target fraction of zero weights (0 = no pruning)
+        epochs: Maximum training epochs
+        output: Where to save the compact model
+    """
+    
+    print("🔄 Loading preprocessed data...")
+    X_train = np.load('processed_data/X_train.npy')
+    X_test = np.load('processed_data/X_test.npy')
+    y_train = np.load('processed_data/y_train.npy')
+    y_test = np.load('processed_data/y_test.npy')
+    
+    # Create models
+    print("\n🧠 Creating compact model...")
+    student = create_compact_model(width)
+    print(f"   Parameters: {student.count_params():,}")
+    
+    teacher = None
+    if teacher_path and Path(teacher_path).exists():
+        print(f"   Distilling from: {teacher_path} (T={temperature}, alpha={alpha})")
+        teacher = tf.keras.models.load_model(teacher_path, compile=False)
+        model = Distiller(student, teacher)
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            metrics=['accuracy'],
+            alpha=alpha,
+            temperature=temperature
+        )
+    else:
+        print("   No teacher model found, training on labels only")
+        model = student
+    
+    # Callbacks (pruning last so it runs after the best weights are restored)
+    callbacks = [
+        EarlyStopping(
+            monitor='val_loss',
+            patience=10,
+            restore_best_weights=True,
+            verbose=1
+        ),
+        ReduceLROnPlateau(
+            monitor='val_loss',
+            factor=0.5,
+            patience=5,
+            min_lr=1e-7,
+            verbose=1
+        )
+    ]
+    if prune_sparsity > 0:
+        print(f"   Magnitude pruning to {prune_sparsity*100:.0f}% sparsity")
+        callbacks.append(MagnitudePruning(
+            prune_sparsity,
+            begin_epoch=2,
+            end_epoch=max(3, int(epochs * 0.6)),
+            model=student
+        ))
+    
+    # Train
+    print("\n🚀 Starting training...")
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(X_test, y_test),
+        epochs=epochs,
+        batch_size=64,
+        callbacks=callbacks,
+        verbose=1
+    )
+    
+    # Evaluate
+    print("\n📊 Evaluating compact model...")
+    test_loss, test_acc = student.evaluate(X_test, y_test, verbose=0)
+    print(f"   Test Accuracy: {test_acc*100:.2f}%")
+    print(f"   Test Loss: {test_loss:.4f}")
+    if prune_sparsity > 0:
+        print(f"   Sparsity: {model_sparsity(student)*100:.1f}%")
+    
+    # Save the student only (the distillation wrapper is a training aid)
+    student.save(output)
+    print(f"\n✅ Model saved to: {output}")
+    export_for_inference(output, X_test)
+    
+    # Compare against the baseline, whether or not it was the teacher
+    models = []
+    if Path(BASELINE_MODEL_PATH).exists():
+        if teacher is not None and Path(teacher_path).resolve() == Path(BASELINE_MODEL_PATH).resolve():
+            baseline = teacher
+        else:
+            baseline = tf.keras.models.load_model(BASELINE_MODEL_PATH, compile=False)
+        models.append(('baseline', baseline))
+    else:
+        print(f"⚠️ No baseline model at {BASELINE_MODEL_PATH}, report has no baseline row")
+    models.append((Path(output).stem, student))
+    compare_models(models, X_test, y_test, output='model_report.json')
+    
+    return student, history
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the emotion model")
+    parser.add_argument('--variant', choices=['baseline', 'compact'], default='baseline')
+    parser.add_argument('--teacher', default=BASELINE_MODEL_PATH, help="Model to distill from (compact only)")
+    parser.add_argument('--no-distill', action='store_true', help="Train the compact model on labels only")
+    parser.add_argument('--width', type=int, default=16, help="Filters of the first compact block")
+    parser.add_argument('--temperature', type=float, default=4.0)
+    parser.add_argument('--alpha', type=float, default=0.3, help="Weight of the label loss")
+    parser.add_argument('--prune-sparsity', type=float, default=0.0, help="Target fraction of zero weights")
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--output', default=COMPACT_MODEL_PATH)
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    model, history = train_model()
\ No newline at end of file
+    args = parse_args()
+    if args.variant == 'compact':
+        model, history = train_compact_model(
+            teacher_path=None if args.no_distill else args.teacher,
+            width=args.width,
+            temperature=args.temperature,
+            alpha=args.alpha,
+            prune_sparsity=args.prune_sparsity,
+            epochs=args.epochs,
+            output=args.output
+        )
+        plot_training_history(history, 'training_history_compact.png')
+    else:
+        model, history = train_model()
\ No newline at end of file
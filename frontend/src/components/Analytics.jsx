@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import {
   BarChart, Bar,
   LineChart, Line,
@@ -14,28 +14,63 @@ const Analytics = () => {
   const [summary, setSummary] = useState(null);
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [fleet, setFleet] = useState(null);
+  const lastSeqRef = useRef(null);
+
+  // Riskiest stations across the fleet (not pushed over SSE, so polled)
+  useEffect(() => {
+    const loadFleet = () => api.getFleetOverview(10)
+      .then(data => data.status === 'success' && setFleet(data))
+      .catch(err => console.error('Failed to load fleet overview:', err));
+    loadFleet();
+    const timer = setInterval(loadFleet, 10000);
+    return () => clearInterval(timer);
+  }, []);
 
   useEffect(() => {
     loadData();
-    const interval = setInterval(loadData, 5000);
-    return () => clearInterval(interval);
+    // Server pushes summaries as frames are analyzed; only new history rows are fetched
+    const unsubscribe = api.subscribeEvents((event) => {
+      if (event.summary?.status === 'success') {
+        setSummary(event.summary);
+      } else if (event.summary?.status === 'no_data') {
+        // Session was reset
+        setSummary(event.summary);
+        setHistory([]);
+        lastSeqRef.current = null;
+        return;
+      }
+      loadHistory().catch(err => console.error('Failed to load history:', err));
+    });
+    return unsubscribe;
   }, []);
 
+  const loadHistory = async () => {
+    const historyData = await api.getPredictionHistory(100, { since: lastSeqRef.current ?? undefined });
+
+    if (historyData.status === 'success') {
+      // Append only the new rows and drop any from before a session reset
+      setHistory(prev => {
+        const rows = historyData.incremental
+          ? [...prev, ...historyData.history]
+          : historyData.history;
+        return rows.filter(row => row.seq >= historyData.first_seq).slice(-100);
+      });
+      lastSeqRef.current = historyData.last_seq;
+    }
+  };
+
   const loadData = async () => {
     try {
-      const [summaryData, historyData] = await Promise.all([
+      const [summaryData] = await Promise.all([
         api.getAnalyticsSummary(),
-        api.getPredictionHistory(100)
+        loadHistory()
       ]);
 
       if (summaryData.status === 'success') {
         setSummary(summaryData);
       }
 
-      if (historyData.status === 'success') {
-        setHistory(historyData.history);
-      }
-
       setLoading(false);
     } catch (err) {
       console.error('Failed to load analytics:', err);
@@ -43,6 +78,43 @@ const Analytics = () => {
     }
   };
 
+  const levelColors = { critical: '#ef4444', warning: '#f59e0b', normal: '#10b981' };
+
+  const fleetCard = fleet && fleet.count > 0 && (
+    <div style={{
+      background: colors.cardBackground,
+      border: `1px solid ${colors.border}`,
+      borderRadius: '12px',
+      padding: '1.5rem',
+      marginTop: '1.5rem'
+    }}>
+      <h3 style={{ marginBottom: '1rem', color: colors.textPrimary }}>
+        Fleet Overview ({fleet.active_stations} active stations)
+      </h3>
+      <p style={{ color: colors.textSecondary, marginBottom: '1rem', fontSize: '0.875rem' }}>
+        {Object.entries(fleet.level_counts).map(([level, count]) => `${level}: ${count}`).join(' · ')}
+      </p>
+      <table style={{ width: '100%', borderCollapse: 'collapse', color: colors.textPrimary, fontSize: '0.875rem' }}>
+        <thead>
+          <tr style={{ color: colors.textSecondary, textAlign: 'left' }}>
+            <th>Station</th><th>Strain Score</th><th>Level</th><th>Trend</th><th>Updated</th>
+          </tr>
+        </thead>
+        <tbody>
+          {fleet.stations.map(station => (
+            <tr key={station.station_id} style={{ borderTop: `1px solid ${colors.border}` }}>
+              <td style={{ padding: '0.5rem 0' }}>{station.station_id}</td>
+              <td>{station.risk_score.toFixed(1)}</td>
+              <td style={{ color: levelColors[station.risk_level], fontWeight: '600' }}>{station.risk_level}</td>
+              <td>{station.trend || '-'}</td>
+              <td>{new Date(station.updated).toLocaleTimeString()}</td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+    </div>
+  );
+
   if (loading) {
     return (
       <div style={{
@@ -74,6 +146,7 @@ const Analytics = () => {
             Start live monitoring to collect analytics
           </p>
         </div>
+        {fleetCard}
       </div>
     );
   }
@@ -355,6 +428,9 @@ const Analytics = () => {
           </div>
         </div>
       </div>
+
+      {/* FLEET OVERVIEW */}
+      {fleetCard}
     </div>
   );
 };
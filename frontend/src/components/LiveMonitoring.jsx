@@ -4,6 +4,9 @@ import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, Responsi
 import { useTheme } from '../context/ThemeContext';
 import api from '../utils/api';
 
+// Used until the server recommends an interval
+const DEFAULT_CAPTURE_INTERVAL_MS = 2000;
+
 const LiveMonitoring = () => {
   const { colors, isDark } = useTheme();
   const [isStreaming, setIsStreaming] = useState(false);
@@ -15,6 +18,7 @@ const LiveMonitoring = () => {
   const canvasRef = useRef(null);
   const streamRef = useRef(null);
   const intervalRef = useRef(null);
+  const loopRef = useRef(0); // Generation of the current capture loop
 
   const startCamera = async () => {
     try {
@@ -28,8 +32,9 @@ const LiveMonitoring = () => {
         setIsStreaming(true);
         setError(null);
         
-        // Start analysis every 2 seconds
-        intervalRef.current = setInterval(captureAndAnalyze, 2000);
+        // Start analysis; the server recommends each following interval
+        loopRef.current += 1;
+        scheduleCapture(loopRef.current, DEFAULT_CAPTURE_INTERVAL_MS);
       }
     } catch (err) {
       setError('Failed to access camera: ' + err.message);
@@ -37,13 +42,15 @@ const LiveMonitoring = () => {
   };
 
   const stopCamera = () => {
+    loopRef.current += 1; // An in-flight capture must not reschedule
+    
     if (streamRef.current) {
       streamRef.current.getTracks().forEach(track => track.stop());
       streamRef.current = null;
     }
     
     if (intervalRef.current) {
-      clearInterval(intervalRef.current);
+      clearTimeout(intervalRef.current);
       intervalRef.current = null;
     }
     
@@ -54,8 +61,16 @@ const LiveMonitoring = () => {
     setIsStreaming(false);
   };
 
-  const captureAndAnalyze = async () => {
-    if (!videoRef.current || !canvasRef.current) return;
+  const scheduleCapture = (loop, delayMs) => {
+    intervalRef.current = setTimeout(() => captureAndAnalyze(loop), delayMs);
+  };
+
+  const captureAndAnalyze = async (loop) => {
+    if (loop !== loopRef.current || !streamRef.current) return;
+    if (!videoRef.current || !canvasRef.current) {
+      scheduleCapture(loop, DEFAULT_CAPTURE_INTERVAL_MS);
+      return;
+    }
     
     const canvas = canvasRef.current;
     const video = videoRef.current;
@@ -68,8 +83,10 @@ const LiveMonitoring = () => {
     
     // Convert to blob
     canvas.toBlob(async (blob) => {
+      let nextDelay = DEFAULT_CAPTURE_INTERVAL_MS;
       try {
         const result = await api.analyzeFrame(blob);
+        nextDelay = result.recommended_interval_ms ?? DEFAULT_CAPTURE_INTERVAL_MS;
         
         if (result.status === 'success') {
           setCurrentData(result);
@@ -87,6 +104,12 @@ const LiveMonitoring = () => {
         }
       } catch (err) {
         console.error('Analysis error:', err);
+      } finally {
+        // Keep capturing until the camera is stopped; a stop (or a stop and
+        // restart) while this request was in flight started a new loop
+        if (loop === loopRef.current && streamRef.current) {
+          scheduleCapture(loop, nextDelay);
+        }
       }
     }, 'image/jpeg', 0.8);
   };
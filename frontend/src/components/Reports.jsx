@@ -6,12 +6,36 @@ import api from '../utils/api';
 const Reports = () => {
   const { colors, isDark } = useTheme();
   const [summary, setSummary] = useState(null);
+  const [shiftHistory, setShiftHistory] = useState(null);
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
     loadSummary();
+    loadShiftHistory();
   }, []);
 
+  // Persisted history of the last 24 hours (kept across restarts and resets)
+  const loadShiftHistory = async () => {
+    try {
+      const start = new Date(Date.now() - 24 * 60 * 60 * 1000).toISOString();
+      const data = await api.getShiftHistory({ start, limit: 5000 });
+      if (data.status === 'success') {
+        setShiftHistory(data);
+      }
+    } catch (err) {
+      console.error('Failed to load shift history:', err);
+    }
+  };
+
+  const shiftStats = shiftHistory && shiftHistory.count > 0 ? {
+    first: shiftHistory.history[0].timestamp,
+    last: shiftHistory.history[shiftHistory.count - 1].timestamp,
+    avgFatigue: shiftHistory.history.reduce((sum, row) => sum + row.fatigue, 0) / shiftHistory.count,
+    avgStress: shiftHistory.history.reduce((sum, row) => sum + row.stress, 0) / shiftHistory.count,
+    avgRisk: shiftHistory.history.reduce((sum, row) => sum + row.risk_score, 0) / shiftHistory.count,
+    maxRisk: Math.max(...shiftHistory.history.map(row => row.risk_score))
+  } : null;
+
   const loadSummary = async () => {
     setLoading(true);
     try {
@@ -35,6 +59,8 @@ const Reports = () => {
       const res = await api.resetSession();
       // Set summary to no_data so the UI shows the default/no-data state
       setSummary({ status: 'no_data', message: res?.message || 'Session reset' });
+      // Shift history is kept, but now includes the whole reset session
+      loadShiftHistory();
     } catch (err) {
       console.error('Failed to reset session:', err);
     } finally {
@@ -65,6 +91,13 @@ const Reports = () => {
     a.click();
   };
 
+  // Full shift history of every station, streamed by the server
+  const exportShiftHistory = () => {
+    const a = document.createElement('a');
+    a.href = api.getHistoryExportUrl({ format: 'csv' });
+    a.click();
+  };
+
   const generatePDFContent = () => {
     if (!summary || !summary.statistics) return;
 
@@ -141,7 +174,7 @@ Report generated by WorkerGuard Fatigue Detection System
         <h3 style={{ fontSize: '1.125rem', fontWeight: '600', marginBottom: '1.5rem', color: colors.textPrimary }}>
           Quick Actions
         </h3>
-        <div style={{ display: 'grid', gridTemplateColumns: 'repeat(3, 1fr)', gap: '1rem' }}>
+        <div style={{ display: 'grid', gridTemplateColumns: 'repeat(4, 1fr)', gap: '1rem' }}>
           <button
             onClick={exportCSV}
             className="btn-primary"
@@ -162,6 +195,15 @@ Report generated by WorkerGuard Fatigue Detection System
             Export Report
           </button>
           
+          <button
+            onClick={exportShiftHistory}
+            className="btn-primary"
+            style={{ display: 'flex', alignItems: 'center', justifyContent: 'center', gap: '0.5rem' }}
+          >
+            <Download size={18} />
+            Export Shift History
+          </button>
+          
           <button
             onClick={resetSession}
             className="btn-secondary"
@@ -174,6 +216,66 @@ Report generated by WorkerGuard Fatigue Detection System
         </div>
       </div>
 
+      {/* Shift History (persisted) */}
+      <div style={{ 
+        background: colors.cardBackground,
+        border: `1px solid ${colors.border}`,
+        borderRadius: '12px',
+        padding: '1.5rem',
+        marginBottom: '1.5rem'
+      }}>
+        <h3 style={{ fontSize: '1.125rem', fontWeight: '600', marginBottom: '1.5rem', color: colors.textPrimary }}>
+          Shift History (last 24 hours)
+        </h3>
+        
+        {shiftStats ? (
+          <div style={{ display: 'grid', gridTemplateColumns: 'repeat(4, 1fr)', gap: '1.5rem' }}>
+            <div>
+              <p style={{ fontSize: '0.75rem', color: colors.textSecondary, marginBottom: '0.5rem' }}>
+                Samples{shiftHistory.truncated ? ' (latest)' : ''}
+              </p>
+              <p style={{ fontSize: '1.25rem', fontWeight: '600', color: colors.textPrimary }}>
+                {shiftHistory.count}
+              </p>
+              <p style={{ fontSize: '0.75rem', color: colors.textSecondary }}>
+                {new Date(shiftStats.first).toLocaleTimeString()} – {new Date(shiftStats.last).toLocaleTimeString()}
+              </p>
+            </div>
+            
+            <div>
+              <p style={{ fontSize: '0.75rem', color: colors.textSecondary, marginBottom: '0.5rem' }}>
+                Average Fatigue
+              </p>
+              <p style={{ fontSize: '1.25rem', fontWeight: '600', color: '#667eea' }}>
+                {shiftStats.avgFatigue.toFixed(1)}%
+              </p>
+            </div>
+            
+            <div>
+              <p style={{ fontSize: '0.75rem', color: colors.textSecondary, marginBottom: '0.5rem' }}>
+                Average Stress
+              </p>
+              <p style={{ fontSize: '1.25rem', fontWeight: '600', color: '#764ba2' }}>
+                {shiftStats.avgStress.toFixed(1)}%
+              </p>
+            </div>
+            
+            <div>
+              <p style={{ fontSize: '0.75rem', color: colors.textSecondary, marginBottom: '0.5rem' }}>
+                Average / Maximum Strain
+              </p>
+              <p style={{ fontSize: '1.25rem', fontWeight: '600', color: getRiskLevel(shiftStats.avgRisk).color }}>
+                {shiftStats.avgRisk.toFixed(1)} / {shiftStats.maxRisk.toFixed(1)}
+              </p>
+            </div>
+          </div>
+        ) : (
+          <p style={{ color: colors.textSecondary }}>
+            No history recorded in the last 24 hours
+          </p>
+        )}
+      </div>
+
       {/* Session Summary */}
       {summary && summary.status === 'success' ? (
         <>
@@ -23,14 +23,54 @@ export const api = {
     return response.data;
   },
   
-  // Get prediction history
-  getPredictionHistory: async (limit = 100) => {
+  // Get prediction history (pass bucketSeconds for min/mean/max per time bucket)
+  // or since (last seen seq) to fetch only rows added after it
+  getPredictionHistory: async (limit = 100, { bucketSeconds, start, end, since } = {}) => {
     const response = await axios.get(`${API_BASE_URL}/analytics/history`, {
-      params: { limit }
+      params: { limit, bucket_seconds: bucketSeconds, start, end, since }
     });
     return response.data;
   },
   
+  // Get persisted shift history (survives restarts and session resets)
+  getShiftHistory: async ({ stationId, start, end, limit } = {}) => {
+    const response = await axios.get(`${API_BASE_URL}/reports/history`, {
+      params: { station_id: stationId, start, end, limit }
+    });
+    return response.data;
+  },
+  
+  // URL of a streamed CSV/Parquet download of the shift history
+  // (stationIds/riskLevels empty = all)
+  getHistoryExportUrl: ({ format = 'csv', stationIds = [], start, end, riskLevels = [] } = {}) => {
+    const url = new URL(`${API_BASE_URL}/reports/export`);
+    url.searchParams.set('format', format);
+    stationIds.forEach((id) => url.searchParams.append('station_id', id));
+    riskLevels.forEach((level) => url.searchParams.append('risk_level', level));
+    if (start) url.searchParams.set('start', start);
+    if (end) url.searchParams.set('end', end);
+    return url.toString();
+  },
+  
+  // Get the highest-risk stations across the fleet
+  getFleetOverview: async (limit = 20, riskLevel) => {
+    const response = await axios.get(`${API_BASE_URL}/fleet/overview`, {
+      params: { limit, risk_level: riskLevel }
+    });
+    return response.data;
+  },
+  
+  // Subscribe to pushed risk/summary updates (stationId null = all stations);
+  // returns an unsubscribe function
+  subscribeEvents: (onUpdate, stationId = 'default') => {
+    const url = new URL(`${API_BASE_URL}/stream/events`);
+    if (stationId) url.searchParams.set('station_id', stationId);
+    
+    const source = new EventSource(url);
+    source.addEventListener('update', (e) => onUpdate(JSON.parse(e.data)));
+    return () => source.close();
+  },
+  
   // Reset session
   resetSession: async () => {
     const response = await axios.post(`${API_BASE_URL}/session/reset`);